@@ -1,47 +1,129 @@
-﻿using System;
-using System.IO;
-using Microsoft.CodeAnalysis;
-using Microsoft.CodeAnalysis.CSharp;
-using Microsoft.CodeAnalysis.CSharp.Syntax;
-
-class Program
-{
-    static void Main(string[] args)
-    {
-        if (args.Length == 0)
-        {
-            Console.WriteLine("Please provide a C# file to parse.");
-            return;
-        }
-
-        string code = File.ReadAllText(args[0]);
-        SyntaxTree tree = CSharpSyntaxTree.ParseText(code);
-        var root = tree.GetRoot() as CompilationUnitSyntax;
-
-        bool hasBasicHandling = false;
-        bool hasAdvancedHandling = false;
-
-        foreach (var node in root.DescendantNodes())
-        {
-            if (node is TryStatementSyntax)
-                hasBasicHandling = true;
-
-            if (node is InvocationExpressionSyntax invocation)
-            {
-                var expression = invocation.Expression.ToString();
-                if (expression.Contains("timeout") || expression.Contains("retry") ||
-                    expression.Contains("CircuitBreaker") || expression.Contains("backoff"))
-                {
-                    hasAdvancedHandling = true;
-                }
-
-                if (expression.Contains("StatusCode"))
-                {
-                    hasBasicHandling = true;
-                }
-            }
-        }
-
-        Console.WriteLine($"{hasBasicHandling},{hasAdvancedHandling}");
-    }
-}
\ No newline at end of file
+﻿using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text.Json;
+using Microsoft.CodeAnalysis;
+using Microsoft.CodeAnalysis.CSharp;
+using Microsoft.CodeAnalysis.CSharp.Syntax;
+
+class Program
+{
+    static void Main(string[] args)
+    {
+        if (args.Length == 0)
+        {
+            Console.WriteLine("Please provide a C# file to parse.");
+            return;
+        }
+
+        if (args[0] == "--server")
+        {
+            RunServer();
+            return;
+        }
+
+        if (args[0] == "--batch" || args[0] == "--manifest")
+        {
+            RunBatch(args);
+            return;
+        }
+
+        string code = File.ReadAllText(args[0]);
+        var (hasBasicHandling, hasAdvancedHandling) = Analyze(code);
+
+        Console.WriteLine($"{hasBasicHandling},{hasAdvancedHandling}");
+    }
+
+    // Worker-server mode: one JSON request per stdin line ({"path": ...} or {"code": ...}),
+    // one JSON result per stdout line. Exits when stdin is closed.
+    static void RunServer()
+    {
+        string? line;
+        while ((line = Console.In.ReadLine()) != null)
+        {
+            if (string.IsNullOrWhiteSpace(line))
+                continue;
+
+            string response;
+            try
+            {
+                using var request = JsonDocument.Parse(line);
+                var root = request.RootElement;
+                string code = root.TryGetProperty("code", out var codeElement)
+                    ? codeElement.GetString() ?? ""
+                    : File.ReadAllText(root.GetProperty("path").GetString() ?? "");
+
+                var (hasBasicHandling, hasAdvancedHandling) = Analyze(code);
+                response = JsonSerializer.Serialize(new { hasBasicHandling, hasAdvancedHandling });
+            }
+            catch (Exception e)
+            {
+                response = JsonSerializer.Serialize(new { error = e.Message });
+            }
+
+            Console.Out.WriteLine(response);
+            Console.Out.Flush();
+        }
+    }
+
+    // Batch mode: "--batch <path>..." or "--manifest <file with one path per line>".
+    // Prints a JSON array with one result object per input path.
+    static void RunBatch(string[] args)
+    {
+        IEnumerable<string> paths = args[0] == "--manifest"
+            ? File.ReadAllLines(args[1]).Where(path => !string.IsNullOrWhiteSpace(path))
+            : args.Skip(1);
+
+        var results = new List<Dictionary<string, object>>();
+        foreach (var path in paths)
+        {
+            var result = new Dictionary<string, object> { ["path"] = path };
+            try
+            {
+                var (hasBasicHandling, hasAdvancedHandling) = Analyze(File.ReadAllText(path));
+                result["hasBasicHandling"] = hasBasicHandling;
+                result["hasAdvancedHandling"] = hasAdvancedHandling;
+            }
+            catch (Exception e)
+            {
+                result["error"] = e.Message;
+            }
+            results.Add(result);
+        }
+
+        Console.WriteLine(JsonSerializer.Serialize(results));
+    }
+
+    static (bool, bool) Analyze(string code)
+    {
+        SyntaxTree tree = CSharpSyntaxTree.ParseText(code);
+        var root = (CompilationUnitSyntax)tree.GetRoot();
+
+        bool hasBasicHandling = false;
+        bool hasAdvancedHandling = false;
+
+        foreach (var node in root.DescendantNodes())
+        {
+            if (node is TryStatementSyntax)
+                hasBasicHandling = true;
+
+            if (node is InvocationExpressionSyntax invocation)
+            {
+                var expression = invocation.Expression.ToString();
+                if (expression.Contains("timeout") || expression.Contains("retry") ||
+                    expression.Contains("CircuitBreaker") || expression.Contains("backoff"))
+                {
+                    hasAdvancedHandling = true;
+                }
+
+                if (expression.Contains("StatusCode"))
+                {
+                    hasBasicHandling = true;
+                }
+            }
+        }
+
+        return (hasBasicHandling, hasAdvancedHandling);
+    }
+}
@@ -1,5 +1,116 @@
 import java.io.File
 
+fun analyzeKotlinCode(kotlinCode: String): Pair<Boolean, Boolean> {
+    var hasBasicHandling = false
+    var hasAdvancedHandling = false
+
+    if ("try" in kotlinCode && "catch" in kotlinCode) {
+        hasBasicHandling = true
+    }
+
+    if ("timeout" in kotlinCode || "retry" in kotlinCode || "CircuitBreaker" in kotlinCode || "backoff" in kotlinCode) {
+        hasAdvancedHandling = true
+    }
+
+    if ("response.code" in kotlinCode || "response.statusCode" in kotlinCode) {
+        hasBasicHandling = true
+    }
+
+    return Pair(hasBasicHandling, hasAdvancedHandling)
+}
+
+// Reads the string value of a top-level key from a single-line JSON request.
+fun jsonStringField(json: String, key: String): String? {
+    val match = Regex("\"" + Regex.escape(key) + "\"\\s*:\\s*\"").find(json) ?: return null
+    val value = StringBuilder()
+    var i = match.range.last + 1
+    while (i < json.length) {
+        val c = json[i]
+        when {
+            c == '"' -> return value.toString()
+            c == '\\' && i + 1 < json.length -> {
+                val escaped = json[i + 1]
+                when (escaped) {
+                    'n' -> value.append('\n')
+                    'r' -> value.append('\r')
+                    't' -> value.append('\t')
+                    'b' -> value.append('\b')
+                    'f' -> value.append('\u000C')
+                    'u' -> {
+                        value.append(json.substring(i + 2, i + 6).toInt(16).toChar())
+                        i += 4
+                    }
+                    else -> value.append(escaped)
+                }
+                i += 2
+                continue
+            }
+            else -> value.append(c)
+        }
+        i++
+    }
+    return null
+}
+
+fun jsonString(value: String?): String {
+    val escaped = StringBuilder("\"")
+    for (c in value ?: "") {
+        when {
+            c == '"' -> escaped.append("\\\"")
+            c == '\\' -> escaped.append("\\\\")
+            c == '\n' -> escaped.append("\\n")
+            c == '\r' -> escaped.append("\\r")
+            c == '\t' -> escaped.append("\\t")
+            c < ' ' -> escaped.append(String.format("\\u%04x", c.code))
+            else -> escaped.append(c)
+        }
+    }
+    return escaped.append('"').toString()
+}
+
+fun resultJson(result: Pair<Boolean, Boolean>): String =
+    "{\"hasBasicHandling\":${result.first},\"hasAdvancedHandling\":${result.second}}"
+
+fun errorJson(message: String?): String = "{\"error\":" + jsonString(message) + "}"
+
+// Batch mode: "--batch <path>..." or "--manifest <file with one path per line>".
+// Prints a JSON array with one result object per input path.
+fun runBatch(args: Array<String>) {
+    val paths = if (args[0] == "--manifest") {
+        File(args[1]).readLines().filter { it.isNotBlank() }
+    } else {
+        args.drop(1)
+    }
+    val results = paths.map { path ->
+        val result = try {
+            resultJson(analyzeKotlinCode(File(path).readText()))
+        } catch (e: Exception) {
+            errorJson(e.message)
+        }
+        "{\"path\":" + jsonString(path) + "," + result.removePrefix("{")
+    }
+    println(results.joinToString(",", "[", "]"))
+}
+
+// Worker-server mode: one JSON request per stdin line ({"path": ...} or {"code": ...}),
+// one JSON result per stdout line. Exits when stdin is closed.
+fun runServer() {
+    val reader = System.`in`.bufferedReader(Charsets.UTF_8)
+    while (true) {
+        val line = reader.readLine() ?: break
+        if (line.isBlank()) continue
+        val response = try {
+            val code = jsonStringField(line, "code")
+                ?: jsonStringField(line, "path")?.let { File(it).readText() }
+            if (code == null) errorJson("Request has neither 'code' nor 'path'") else resultJson(analyzeKotlinCode(code))
+        } catch (e: Exception) {
+            errorJson(e.message)
+        }
+        println(response)
+        System.out.flush()
+    }
+}
+
 fun main(args: Array<String>) {
     try {
         if (args.isEmpty()) {
@@ -7,34 +118,29 @@ fun main(args: Array<String>) {
             return
         }
 
-        val filePath = args[0]
-        val file = File(filePath)
-        
-        if (!file.exists()) {
-            println("false,false")
+        if (args[0] == "--server") {
+            runServer()
             return
         }
 
-        val kotlinCode = file.readText()
-
-        var hasBasicHandling = false
-        var hasAdvancedHandling = false
-
-        if ("try" in kotlinCode && "catch" in kotlinCode) {
-            hasBasicHandling = true
+        if (args[0] == "--batch" || args[0] == "--manifest") {
+            runBatch(args)
+            return
         }
 
-        if ("timeout" in kotlinCode || "retry" in kotlinCode || "CircuitBreaker" in kotlinCode || "backoff" in kotlinCode) {
-            hasAdvancedHandling = true
-        }
+        val filePath = args[0]
+        val file = File(filePath)
 
-        if ("response.code" in kotlinCode || "response.statusCode" in kotlinCode) {
-            hasBasicHandling = true
+        if (!file.exists()) {
+            println("false,false")
+            return
         }
 
+        val (hasBasicHandling, hasAdvancedHandling) = analyzeKotlinCode(file.readText())
+
         println("${hasBasicHandling.toString().lowercase()},${hasAdvancedHandling.toString().lowercase()}")
     } catch (e: Exception) {
         System.err.println("Error processing Kotlin file: ${e.message}")
         println("false,false")
     }
-}
\ No newline at end of file
+}
@@ -1,32 +1,87 @@
 import ast
+import atexit
+import codecs
 import csv
 import functools
+import hashlib
+import importlib
 import io
 import json
 import logging
+import mmap
+import multiprocessing
 import os
-import pickle
+import queue
 import random
 import re
 import shutil
+import signal
+import sqlite3
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import unicodedata
 import warnings
 from configparser import ConfigParser
-from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
 from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
-from multiprocessing import Manager, Pool
+from multiprocessing.util import Finalize
 from pathlib import Path
+from urllib.parse import urlsplit
 import babel
 import psutil
-import timeout_decorator
 from tqdm import tqdm
 
-# Increase recursion limit if necessary
-sys.setrecursionlimit(1500)
+try:
+    import tree_sitter
+except ImportError:
+    tree_sitter = None
+
+# Runtime settings read from config.ini by load_settings(); Pool workers receive a copy through worker_init
+SETTINGS = {
+    'use_parser_daemons': True,
+    'check_remote_head': True,
+    'file_cache_path': '',
+    'file_cache_max_entries': 500000,
+    'parser_batch_size': 64,
+    'java_preprocess_fallback': False,
+    'full_scan': False,
+    'max_parallel_parsers': os.cpu_count() or 1,
+    'repos_in_flight': 2 * (os.cpu_count() or 1),
+    'clone_workers': 8,
+    'clone_disk_budget_mb': 4096,
+    'fetch_mode': 'full',
+    'max_file_size_kb': 1024,
+    'pruned_directories': [
+        '.git', 'node_modules', 'bower_components', 'vendor', 'third_party', 'Pods', 'Carthage',
+        'dist', 'build', '.venv', 'venv', 'site-packages', '__pycache__', '.gradle'
+    ],
+    'use_ignore_files': True,
+    'parser_engines': {},
+    'keyword_prefilter': True,
+    'parser_timeouts': {},
+    'parser_timeout_per_mb': 30,
+    'repo_deadline': 3600,
+    'log_level': logging.INFO,
+    'log_buffer_records': 256,
+    'debug_sample_rate': 100,
+    'metrics_enabled': False,
+    'metrics_path': 'metrics.prom',
+    'metrics_format': 'prometheus',
+    'metrics_interval': 60,
+    'resource_sample_interval': 2,
+    'min_free_memory_percent': 10,
+    'min_free_disk_mb': 2048,
+    'max_load_per_cpu': 2.0,
+}
+
+# Concurrency budget for parser work shared by every worker process (see parse_slot)
+PARSE_SLOTS = None
 
 
 # Function to suppress warnings temporarily during progress bar updates
@@ -34,49 +89,357 @@ def suppress_warnings():
     warnings.filterwarnings("ignore", category=FutureWarning)
     warnings.filterwarnings("ignore", category=UserWarning)
 
-# Function to redirect logs to file
+# Function to redirect logs to file. Warnings and errors of the main process also go to log_file;
+# calling it again with the same file does not add a second handler
 def redirect_logs_to_file(log_file='processing_warnings.log'):
-    # Setting up logging to file
+    logger = logging.getLogger()
+    log_file = os.path.abspath(log_file)
+    if any(getattr(handler, 'baseFilename', None) == log_file for handler in logger.handlers):
+        return
     handler = RotatingFileHandler(log_file, maxBytes=100 * 1024, backupCount=2)
-    logging.getLogger().addHandler(handler)
-    
+    handler.setLevel(logging.WARNING)
+    logger.addHandler(handler)
+
+
+# One thread in the main process samples free memory, free disk in clone_dir and the load
+# average every sample_interval seconds ([resources] section of config.ini). New clones pause
+# while memory or disk is below its watermark, and the number of repositories in flight is
+# halved while the load per CPU is above max_load_per_cpu or a watermark is crossed, and grows
+# back by one per sample, up to repos_in_flight, once it is not.
+class ResourceSampler:
+    def __init__(self, path, max_in_flight, settings=None):
+        settings = settings or SETTINGS
+        self.path = path
+        self.max_in_flight = max_in_flight
+        self.interval = settings['resource_sample_interval']
+        self.min_free_memory_percent = settings['min_free_memory_percent']
+        self.min_free_disk = settings['min_free_disk_mb'] * 1024 * 1024
+        self.max_load_per_cpu = settings['max_load_per_cpu']
+        self.in_flight_limit = max_in_flight
+        self.paused = False
+        self.sample = {}
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='resource-sampler', daemon=True)
+
+    def __enter__(self):
+        self.take_sample()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop_event.set()
+        self.thread.join()
+        return False
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.take_sample()
+            except Exception as e:
+                logging.error(f"Resource sampling failed: {e}")
+
+    def take_sample(self):
+        memory = psutil.virtual_memory()
+        disk_free = shutil.disk_usage(self.path).free
+        load_per_cpu = psutil.getloadavg()[0] / (os.cpu_count() or 1)
+        self.sample = {
+            'memory_available_percent': 100 * memory.available / memory.total,
+            'disk_free_mb': disk_free / (1024 * 1024),
+            'load_per_cpu': load_per_cpu
+        }
+
+        reasons = []
+        if self.sample['memory_available_percent'] < self.min_free_memory_percent:
+            reasons.append(f"{self.sample['memory_available_percent']:.0f}% memory available")
+        if disk_free < self.min_free_disk:
+            reasons.append(f"{self.sample['disk_free_mb']:.0f} MB free in {self.path}")
+        if reasons and not self.paused:
+            logging.warning(f"Pausing new clones: {', '.join(reasons)}")
+        elif not reasons and self.paused:
+            logging.info("Resuming clones")
+        self.paused = bool(reasons)
+
+        limit = self.in_flight_limit
+        if self.paused or (self.max_load_per_cpu > 0 and load_per_cpu > self.max_load_per_cpu):
+            limit = max(1, limit // 2)
+        else:
+            limit = min(self.max_in_flight, limit + 1)
+        if limit != self.in_flight_limit:
+            logging.info(f"Repositories in flight: {self.in_flight_limit} -> {limit} (load {load_per_cpu:.2f} per CPU)")
+            self.in_flight_limit = limit
+
+    def describe(self):
+        return (f"{self.sample.get('memory_available_percent', 0):.0f}% memory available, "
+                f"{self.sample.get('disk_free_mb', 0) / 1024:.2f} GB free in {self.path}, "
+                f"load {self.sample.get('load_per_cpu', 0):.2f} per CPU")
+
+
+# Pipeline metrics ([metrics] section of config.ini): a histogram of the time spent in each stage
+# (remote_head, clone, discover, read, parse, analyze, cleanup) per language, counts
+# of files by how they were settled and of parser failures by kind. Every process records into
+# its own Metrics; Pool workers hand theirs back with each analyzed repository and the main
+# process merges them and periodically rewrites metrics_path as a Prometheus textfile or JSON.
+# When metrics are off, stage_timer returns a shared no-op context and nothing is recorded.
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 1800)
+METRICS_FORMATS = ('prometheus', 'json')
+# Counters and their kinds: files by how they were settled (cached, prefiltered, parsed) and
+# parser failures (rejected: the parser refused a file; timeout and unavailable: a file got
+# 'Timeout' or no result; exit_status, bad_output and exception: a whole parser call failed)
+METRIC_COUNTERS = {
+    'files': 'Analyzed files by how their result was obtained',
+    'parser_failures': 'Parser failures by kind'
+}
+NO_STAGE_TIMER = nullcontext()
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (stage, language) -> [count per bucket..., count above the last bucket, sum of seconds]
+        self.stages = {}
+        # (name, language, kind) -> count
+        self.counters = {}
+
+    def observe(self, stage, language, seconds):
+        with self.lock:
+            histogram = self.stages.get((stage, language))
+            if histogram is None:
+                histogram = self.stages[(stage, language)] = [0] * (len(STAGE_BUCKETS) + 2)
+            for index, bound in enumerate(STAGE_BUCKETS):
+                if seconds <= bound:
+                    break
+            else:
+                index = len(STAGE_BUCKETS)
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    def count(self, name, language, kind, amount=1):
+        if amount:
+            with self.lock:
+                key = (name, language, kind)
+                self.counters[key] = self.counters.get(key, 0) + amount
+
+    # Returns everything recorded so far as plain dicts for merge() and starts over
+    def drain(self):
+        with self.lock:
+            snapshot = {'stages': self.stages, 'counters': self.counters}
+            self.stages = {}
+            self.counters = {}
+        return snapshot
+
+    def merge(self, snapshot):
+        with self.lock:
+            for key, histogram in snapshot['stages'].items():
+                if key in self.stages:
+                    self.stages[key] = [a + b for a, b in zip(self.stages[key], histogram)]
+                else:
+                    self.stages[key] = list(histogram)
+            for key, value in snapshot['counters'].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_prometheus(self):
+        lines = [
+            '# HELP webservfh_stage_seconds Time spent in each pipeline stage',
+            '# TYPE webservfh_stage_seconds histogram'
+        ]
+        for (stage, language), histogram in sorted(self.stages.items()):
+            labels = f'stage="{stage}",language="{language}"'
+            cumulative = 0
+            for bound, count in zip(STAGE_BUCKETS + ('+Inf',), histogram):
+                cumulative += count
+                lines.append(f'webservfh_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'webservfh_stage_seconds_sum{{{labels}}} {histogram[-1]:.6f}')
+            lines.append(f'webservfh_stage_seconds_count{{{labels}}} {cumulative}')
+        for name in sorted({key[0] for key in self.counters}):
+            lines.append(f'# HELP webservfh_{name}_total {METRIC_COUNTERS.get(name, name)}')
+            lines.append(f'# TYPE webservfh_{name}_total counter')
+            for (_, language, kind), value in sorted(item for item in self.counters.items() if item[0][0] == name):
+                lines.append(f'webservfh_{name}_total{{language="{language}",kind="{kind}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        return json.dumps({
+            'timestamp': time.time(),
+            'stages': [
+                {'stage': stage, 'language': language, 'count': sum(histogram[:-1]), 'sum_seconds': round(histogram[-1], 6),
+                 'buckets': dict(zip([str(bound) for bound in STAGE_BUCKETS] + ['+Inf'], histogram[:-1]))}
+                for (stage, language), histogram in sorted(self.stages.items())
+            ],
+            'counters': [
+                {'name': name, 'language': language, 'kind': kind, 'value': value}
+                for (name, language, kind), value in sorted(self.counters.items())
+            ]
+        }, indent=2)
+
+    # Replaces the file in one rename, so the textfile collector never reads a partial file
+    def write(self, path, metrics_format):
+        with self.lock:
+            content = self.to_json() if metrics_format == 'json' else self.to_prometheus()
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logging.error(f"Cannot write metrics to {path}: {e}")
+
+
+class StageTimer:
+    __slots__ = ('stage', 'language', 'start')
+
+    def __init__(self, stage, language):
+        self.stage = stage
+        self.language = language
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        get_metrics().observe(self.stage, self.language, time.perf_counter() - self.start)
+        return False
+
+
+_METRICS = None
+_METRICS_PID = None
+_METRICS_LOCK = threading.Lock()
+
+
+# A forked worker starts with empty metrics instead of a copy of its parent's
+def get_metrics():
+    global _METRICS, _METRICS_PID
+    if _METRICS_PID != os.getpid():
+        with _METRICS_LOCK:
+            if _METRICS_PID != os.getpid():
+                _METRICS = Metrics()
+                _METRICS_PID = os.getpid()
+    return _METRICS
+
+
+def stage_timer(stage, language='', settings=None):
+    if not (settings or SETTINGS)['metrics_enabled']:
+        return NO_STAGE_TIMER
+    return StageTimer(stage, language)
+
+
+def count_metric(name, language, kind, amount=1):
+    if SETTINGS['metrics_enabled']:
+        get_metrics().count(name, language, kind, amount)
+
+
+def write_metrics(settings=None):
+    settings = settings or SETTINGS
+    if settings['metrics_enabled'] and settings['metrics_path']:
+        get_metrics().write(settings['metrics_path'], settings['metrics_format'])
+
+# Log records of every process go through one multiprocessing.Queue (a pipe, not a Manager
+# proxy) to a listener thread in the main process that writes processing.log. Workers send them
+# in batches: BufferedQueueHandler puts one list of records on the queue when it holds
+# [logging] buffer_records records, right away for warnings and errors, once LOG_FLUSH_INTERVAL
+# has passed and after every repository. Records below [logging] level are dropped by the
+# logger before any handler formats them.
+LOG_FLUSH_INTERVAL = 1.0
+
+
+class BufferedQueueHandler(QueueHandler):
+    def __init__(self, log_queue, capacity):
+        super().__init__(log_queue)
+        self.capacity = capacity
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if (len(self.buffer) >= self.capacity or record.levelno >= logging.WARNING
+                or time.monotonic() - self.last_flush >= LOG_FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer:
+                self.enqueue(self.buffer)
+                self.buffer = []
+            self.last_flush = time.monotonic()
+        finally:
+            self.release()
+
+
+class BatchQueueListener(QueueListener):
+    def handle(self, record):
+        if isinstance(record, list):
+            for item in record:
+                super().handle(item)
+        else:
+            super().handle(record)
+
+
+def flush_log_buffers():
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, BufferedQueueHandler):
+            handler.flush()
 
-# Disk monitoring function
-def check_disk_usage():
-    usage = shutil.disk_usage('/')
-    logging.info(f"Disk usage: {usage.free / (1024 ** 3):.2f} GB free of {usage.total / (1024 ** 3):.2f} GB")
 
-# System stats logging function
-def log_system_stats():
-    disk_usage = psutil.disk_usage('/')
-    logging.info(f"Disk usage: {disk_usage.free / (1024 ** 3):.2f} GB free")
+# Per-file DEBUG lines are sampled: the first and then every debug_sample_rate-th record of each
+# message is logged. The message takes %-style arguments, so skipped records are never formatted.
+_DEBUG_SAMPLE_COUNTS = {}
 
-    memory_info = psutil.virtual_memory()
-    logging.info(f"Memory usage: {memory_info.percent}% used")
 
-    process_count = len(psutil.pids())
-    logging.info(f"Number of running processes: {process_count}")
+def log_sampled_debug(message, *args):
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    count = _DEBUG_SAMPLE_COUNTS.get(message, 0)
+    _DEBUG_SAMPLE_COUNTS[message] = count + 1
+    if count % SETTINGS['debug_sample_rate'] == 0:
+        logging.debug(message, *args)
+
 
 def setup_logging():
-    manager = Manager()
-    log_queue = manager.Queue()
+    log_queue = multiprocessing.Queue()
     # This log rotation to avoid large log files
     handler = RotatingFileHandler("processing.log", maxBytes=100 * 1024, backupCount=2)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
 
-    listener = QueueListener(log_queue, handler)
+    listener = BatchQueueListener(log_queue, handler)
     listener.start()
 
     logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
 
     return log_queue, listener
 
-def worker_init(log_queue):
-    queue_handler = QueueHandler(log_queue)
+def close_log_queue(handler, log_queue):
+    handler.flush()
+    log_queue.close()
+    log_queue.join_thread()
+
+
+def worker_init(log_queue, settings=None, parse_slots=None):
+    global PARSE_SLOTS, _PARSER_PROCESSES
+    if settings:
+        SETTINGS.update(settings)
+    # Handlers inherited from a forked parent would duplicate every record, and file handlers
+    # must not be shared between processes
     logger = logging.getLogger()
-    logger.addHandler(queue_handler)
-    logger.setLevel(logging.INFO)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = BufferedQueueHandler(log_queue, SETTINGS['log_buffer_records'])
+    logger.addHandler(handler)
+    logger.setLevel(SETTINGS['log_level'])
+    # Runs when the worker exits (before the queue's own finalizers, priority 10): the buffered
+    # records are sent and the feeder thread has written them all before the process is gone
+    Finalize(None, close_log_queue, args=(handler, log_queue), exitpriority=100)
+    PARSE_SLOTS = parse_slots
+
+    # Only one parser may run at a time otherwise, so a process pool would not run anything in parallel
+    if SETTINGS['max_parallel_parsers'] > 1:
+        _PARSER_PROCESSES = ParserProcesses(SETTINGS['max_parallel_parsers'])
+        # The parser processes exit before the log queue is closed
+        Finalize(None, _PARSER_PROCESSES.shutdown, exitpriority=110)
 
 def global_exception_handler(exc_type, exc_value, exc_traceback):
     logging.error("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
@@ -87,7 +450,52 @@ def create_config_file():
         'input_csv_file_path': 'input_csv_file_19.csv',
         'output_csv_file_path': 'analyze_error_handling_output.csv',
         'clone_dir': 'cloned_repos',
-        'cache_file': 'analysis_cache.pkl'
+        'cache_file': 'analysis_cache.sqlite',
+        'file_cache_file': 'file_results.sqlite'
+    }
+    config['parsers'] = {
+        'use_daemons': 'true',
+        'batch_size': '64',
+        'java_preprocess_fallback': 'false'
+    }
+    config['analysis'] = {
+        'full_scan': 'false',
+        'max_parallel_parsers': '0',
+        'repos_in_flight': '0',
+        'clone_workers': '8',
+        'clone_disk_budget_mb': '4096',
+        'fetch_mode': 'full',
+        'keyword_prefilter': 'true'
+    }
+    config['discovery'] = {
+        'max_file_size_kb': '1024',
+        'pruned_directories': ', '.join(SETTINGS['pruned_directories']),
+        'use_ignore_files': 'true'
+    }
+    config['engines'] = {language: DEFAULT_PARSER_ENGINES.get(language, 'external') for language in ENGINE_LANGUAGES}
+    config['timeouts'] = {language: str(seconds) for language, seconds in DEFAULT_PARSER_TIMEOUTS.items()}
+    config['timeouts']['seconds_per_mb'] = '30'
+    config['timeouts']['repo_deadline'] = '3600'
+    config['cache'] = {
+        'check_remote_head': 'true',
+        'file_cache_max_entries': '500000'
+    }
+    config['logging'] = {
+        'level': 'INFO',
+        'buffer_records': '256',
+        'debug_sample_rate': '100'
+    }
+    config['resources'] = {
+        'sample_interval': '2',
+        'min_free_memory_percent': '10',
+        'min_free_disk_mb': '2048',
+        'max_load_per_cpu': '2.0'
+    }
+    config['metrics'] = {
+        'enabled': 'false',
+        'path': 'metrics.prom',
+        'format': 'prometheus',
+        'interval': '60'
     }
     with open('config.ini', 'w') as configfile:
         config.write(configfile)
@@ -100,7 +508,58 @@ def update_config_file():
     config['paths']['input_csv_file_path'] = config.get('paths', 'input_csv_file_path', fallback='input_csv_file_19.csv')
     config['paths']['output_csv_file_path'] = config.get('paths', 'output_csv_file_path', fallback='analyze_error_handling_output.csv')
     config['paths']['clone_dir'] = config.get('paths', 'clone_dir', fallback='cloned_repos')
-    config['paths']['cache_file'] = config.get('paths', 'cache_file', fallback='analysis_cache.pkl')
+    config['paths']['cache_file'] = config.get('paths', 'cache_file', fallback='analysis_cache.sqlite')
+    config['paths']['file_cache_file'] = config.get('paths', 'file_cache_file', fallback='file_results.sqlite')
+    if 'parsers' not in config:
+        config['parsers'] = {}
+    config['parsers']['use_daemons'] = config.get('parsers', 'use_daemons', fallback='true')
+    config['parsers']['batch_size'] = config.get('parsers', 'batch_size', fallback='64')
+    config['parsers']['java_preprocess_fallback'] = config.get('parsers', 'java_preprocess_fallback', fallback='false')
+    if 'analysis' not in config:
+        config['analysis'] = {}
+    config['analysis']['full_scan'] = config.get('analysis', 'full_scan', fallback='false')
+    config['analysis']['max_parallel_parsers'] = config.get('analysis', 'max_parallel_parsers', fallback='0')
+    config['analysis']['repos_in_flight'] = config.get('analysis', 'repos_in_flight', fallback='0')
+    config['analysis']['clone_workers'] = config.get('analysis', 'clone_workers', fallback='8')
+    config['analysis']['clone_disk_budget_mb'] = config.get('analysis', 'clone_disk_budget_mb', fallback='4096')
+    config['analysis']['fetch_mode'] = config.get('analysis', 'fetch_mode', fallback='full')
+    config['analysis']['keyword_prefilter'] = config.get('analysis', 'keyword_prefilter', fallback='true')
+    if 'discovery' not in config:
+        config['discovery'] = {}
+    config['discovery']['max_file_size_kb'] = config.get('discovery', 'max_file_size_kb', fallback='1024')
+    config['discovery']['pruned_directories'] = config.get('discovery', 'pruned_directories', fallback=', '.join(SETTINGS['pruned_directories']))
+    config['discovery']['use_ignore_files'] = config.get('discovery', 'use_ignore_files', fallback='true')
+    if 'engines' not in config:
+        config['engines'] = {}
+    for language in ENGINE_LANGUAGES:
+        config['engines'][language] = config.get('engines', language, fallback=DEFAULT_PARSER_ENGINES.get(language, 'external'))
+    if 'timeouts' not in config:
+        config['timeouts'] = {}
+    for language, seconds in DEFAULT_PARSER_TIMEOUTS.items():
+        config['timeouts'][language] = config.get('timeouts', language, fallback=str(seconds))
+    config['timeouts']['seconds_per_mb'] = config.get('timeouts', 'seconds_per_mb', fallback='30')
+    config['timeouts']['repo_deadline'] = config.get('timeouts', 'repo_deadline', fallback='3600')
+    if 'cache' not in config:
+        config['cache'] = {}
+    config['cache']['check_remote_head'] = config.get('cache', 'check_remote_head', fallback='true')
+    config['cache']['file_cache_max_entries'] = config.get('cache', 'file_cache_max_entries', fallback='500000')
+    if 'logging' not in config:
+        config['logging'] = {}
+    config['logging']['level'] = config.get('logging', 'level', fallback='INFO')
+    config['logging']['buffer_records'] = config.get('logging', 'buffer_records', fallback='256')
+    config['logging']['debug_sample_rate'] = config.get('logging', 'debug_sample_rate', fallback='100')
+    if 'resources' not in config:
+        config['resources'] = {}
+    config['resources']['sample_interval'] = config.get('resources', 'sample_interval', fallback='2')
+    config['resources']['min_free_memory_percent'] = config.get('resources', 'min_free_memory_percent', fallback='10')
+    config['resources']['min_free_disk_mb'] = config.get('resources', 'min_free_disk_mb', fallback='2048')
+    config['resources']['max_load_per_cpu'] = config.get('resources', 'max_load_per_cpu', fallback='2.0')
+    if 'metrics' not in config:
+        config['metrics'] = {}
+    config['metrics']['enabled'] = config.get('metrics', 'enabled', fallback='false')
+    config['metrics']['path'] = config.get('metrics', 'path', fallback='metrics.prom')
+    config['metrics']['format'] = config.get('metrics', 'format', fallback='prometheus')
+    config['metrics']['interval'] = config.get('metrics', 'interval', fallback='60')
     with open('config.ini', 'w') as configfile:
         config.write(configfile)
 
@@ -109,188 +568,883 @@ def load_configuration():
     config.read('config.ini')
     return config
 
+def load_settings(config):
+    SETTINGS['use_parser_daemons'] = config.getboolean('parsers', 'use_daemons', fallback=True)
+    SETTINGS['parser_batch_size'] = config.getint('parsers', 'batch_size', fallback=64)
+    SETTINGS['java_preprocess_fallback'] = config.getboolean('parsers', 'java_preprocess_fallback', fallback=False)
+    SETTINGS['full_scan'] = config.getboolean('analysis', 'full_scan', fallback=False)
+    # 0 means one parser per CPU core
+    SETTINGS['max_parallel_parsers'] = config.getint('analysis', 'max_parallel_parsers', fallback=0) or os.cpu_count() or 1
+    # 0 means two repositories per CPU core, so a worker never waits for the next row
+    SETTINGS['repos_in_flight'] = config.getint('analysis', 'repos_in_flight', fallback=0) or 2 * (os.cpu_count() or 1)
+    SETTINGS['clone_workers'] = max(1, config.getint('analysis', 'clone_workers', fallback=8))
+    SETTINGS['clone_disk_budget_mb'] = config.getint('analysis', 'clone_disk_budget_mb', fallback=4096)
+    SETTINGS['fetch_mode'] = config.get('analysis', 'fetch_mode', fallback='full')
+    if SETTINGS['fetch_mode'] not in FETCH_MODES:
+        logging.warning(f"Unknown fetch_mode {SETTINGS['fetch_mode']!r}; using 'full'")
+        SETTINGS['fetch_mode'] = 'full'
+    SETTINGS['keyword_prefilter'] = config.getboolean('analysis', 'keyword_prefilter', fallback=True)
+    SETTINGS['max_file_size_kb'] = config.getint('discovery', 'max_file_size_kb', fallback=1024)
+    pruned_directories = config.get('discovery', 'pruned_directories', fallback=None)
+    if pruned_directories is not None:
+        SETTINGS['pruned_directories'] = [name.strip() for name in pruned_directories.split(',') if name.strip()]
+    SETTINGS['use_ignore_files'] = config.getboolean('discovery', 'use_ignore_files', fallback=True)
+    SETTINGS['parser_engines'] = {}
+    for language in ENGINE_LANGUAGES:
+        engine = config.get('engines', language, fallback=DEFAULT_PARSER_ENGINES.get(language, 'external'))
+        if engine not in PARSER_ENGINES:
+            logging.warning(f"Unknown parser engine {engine!r} for {language}; using 'external'")
+            engine = 'external'
+        if engine == 'tree-sitter' and not tree_sitter_available(language):
+            logging.warning(f"tree-sitter grammar for {language} is not installed; using the external parser")
+            engine = 'external'
+        SETTINGS['parser_engines'][language] = engine
+    SETTINGS['parser_timeouts'] = {
+        language: config.getfloat('timeouts', language, fallback=seconds)
+        for language, seconds in DEFAULT_PARSER_TIMEOUTS.items()
+    }
+    SETTINGS['parser_timeout_per_mb'] = config.getfloat('timeouts', 'seconds_per_mb', fallback=30)
+    # 0 disables the per-repository deadline
+    SETTINGS['repo_deadline'] = config.getfloat('timeouts', 'repo_deadline', fallback=3600)
+    SETTINGS['check_remote_head'] = config.getboolean('cache', 'check_remote_head', fallback=True)
+    # An empty file_cache_file disables the per-file result cache
+    file_cache_path = config.get('paths', 'file_cache_file', fallback='file_results.sqlite')
+    SETTINGS['file_cache_path'] = os.path.abspath(file_cache_path) if file_cache_path else ''
+    SETTINGS['file_cache_max_entries'] = config.getint('cache', 'file_cache_max_entries', fallback=500000)
+    log_level = config.get('logging', 'level', fallback='INFO').upper()
+    if not isinstance(logging.getLevelName(log_level), int):
+        logging.warning(f"Unknown log level {log_level!r}; using 'INFO'")
+        log_level = 'INFO'
+    SETTINGS['log_level'] = logging.getLevelName(log_level)
+    SETTINGS['log_buffer_records'] = max(1, config.getint('logging', 'buffer_records', fallback=256))
+    SETTINGS['debug_sample_rate'] = max(1, config.getint('logging', 'debug_sample_rate', fallback=100))
+    SETTINGS['resource_sample_interval'] = max(0.1, config.getfloat('resources', 'sample_interval', fallback=2))
+    SETTINGS['min_free_memory_percent'] = config.getfloat('resources', 'min_free_memory_percent', fallback=10)
+    SETTINGS['min_free_disk_mb'] = config.getint('resources', 'min_free_disk_mb', fallback=2048)
+    # 0 disables load-based throttling
+    SETTINGS['max_load_per_cpu'] = config.getfloat('resources', 'max_load_per_cpu', fallback=2.0)
+    SETTINGS['metrics_enabled'] = config.getboolean('metrics', 'enabled', fallback=False)
+    metrics_path = config.get('metrics', 'path', fallback='metrics.prom')
+    SETTINGS['metrics_path'] = os.path.abspath(metrics_path) if metrics_path else ''
+    SETTINGS['metrics_format'] = config.get('metrics', 'format', fallback='prometheus')
+    if SETTINGS['metrics_format'] not in METRICS_FORMATS:
+        logging.warning(f"Unknown metrics format {SETTINGS['metrics_format']!r}; using 'prometheus'")
+        SETTINGS['metrics_format'] = 'prometheus'
+    SETTINGS['metrics_interval'] = config.getfloat('metrics', 'interval', fallback=60)
+    return dict(SETTINGS)
+
+# Source files are read once as bytes and decoded once. A BOM decides the encoding; otherwise
+# ASCII and UTF-8 are tried, and anything else is read as Latin-1, which accepts every byte.
+# UTF-32 LE is checked before UTF-16 LE because its BOM starts with the UTF-16 one.
+SOURCE_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'), (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16')
+)
+MMAP_THRESHOLD = 256 * 1024
+
+
+def decode_source(data):
+    if data.isascii():
+        return data.decode('ascii')
+    for bom, encoding in SOURCE_BOMS:
+        if data.startswith(bom):
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                break
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin1')
+
+
+def read_text_file(file_path):
+    with open(file_path, 'rb') as f:
+        return decode_source(f.read())
+
+
+# Yields the contents of a source file as a bytes-like object: read in one call, mapped for large
+# files, only the first 4 KB with head_only, or taken from read_source(file_path) when given
 @contextmanager
-def open_file(file_path):
-    encodings = ['utf-8', 'latin1', 'iso-8859-1', 'ascii', 'utf-16', 'utf-32', 'cp1252', 'cp850', 'mac_roman']
-    for encoding in encodings:
+def open_source(file_path, read_source=None, head_only=False):
+    if read_source is not None:
+        yield read_source(file_path) or b''
+        return
+    try:
+        f = open(file_path, 'rb')
+    except OSError as e:
+        logging.warning(f"Cannot read {file_path}: {e}")
+        yield b''
+        return
+    with f:
+        if head_only:
+            yield f.read(4096)
+        elif os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+        else:
+            yield f.read()
+
+
+# Files and bytes this process has written to the temp dir to hand code to the parsers
+# (reported by benchmarks/temp_io_benchmark.py)
+TEMP_IO_STATS = {'files': 0, 'bytes': 0}
+
+
+def write_temp_file(content, suffix):
+    data = content.encode('utf-8')
+    with tempfile.NamedTemporaryFile(mode='wb', suffix=suffix, delete=False) as temp_file:
+        temp_file.write(data)
+    TEMP_IO_STATS['files'] += 1
+    TEMP_IO_STATS['bytes'] += len(data)
+    return temp_file.name
+
+
+def get_error_handling_type(has_basic_handling, has_advanced_handling):
+    if has_basic_handling and has_advanced_handling:
+        return 'Both'
+    elif has_basic_handling:
+        return 'Basic'
+    elif has_advanced_handling:
+        return 'Advanced'
+    return 'None'
+
+
+def merge_error_handling_types(current, result):
+    return get_error_handling_type(
+        current in ('Basic', 'Both') or result in ('Basic', 'Both'),
+        current in ('Advanced', 'Both') or result in ('Advanced', 'Both')
+    )
+
+
+# Time limits for the external parsers. Each parser process runs in its own process group and is
+# killed as a group when it overruns its budget: the language's [timeouts] base plus
+# seconds_per_mb for every MB of input. A file whose parser timed out gets the result 'Timeout'
+# instead of 'None'; it is not cached, so a later run tries it again.
+TIMEOUT_RESULT = 'Timeout'
+DEFAULT_PARSER_TIMEOUTS = {
+    'java': 60, 'javascript': 30, 'typescript': 30, 'go': 30,
+    'ruby': 30, 'csharp': 60, 'kotlin': 60, 'swift': 60
+}
+
+
+class ParserTimeout(Exception):
+    pass
+
+
+def parser_timeout(language, input_bytes=0):
+    base = SETTINGS['parser_timeouts'].get(language, DEFAULT_PARSER_TIMEOUTS.get(language, 60))
+    return base + SETTINGS['parser_timeout_per_mb'] * input_bytes / (1024 * 1024)
+
+
+def kill_process_group(process):
+    if process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        # No process groups on this platform, or the group is already gone
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                yield f
-            return  # If successful, exit the context manager
-        except UnicodeDecodeError:
-            continue
-    raise UnicodeDecodeError(f"Unable to decode {file_path} with any of the attempted encodings")
+            process.kill()
+        except OSError:
+            pass
+
+
+# One thread per process holds the deadline of every running parser request and kills the
+# parser's process group when its deadline passes, so a parser stuck on a pathological file
+# fails that file instead of blocking its caller.
+class ParserWatchdog:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.deadlines = {}
+        self.expired = set()
+        self.next_token = 0
+        threading.Thread(target=self.run, name='parser-watchdog', daemon=True).start()
+
+    def watch(self, process, timeout):
+        with self.condition:
+            self.next_token += 1
+            self.deadlines[self.next_token] = (time.monotonic() + timeout, process)
+            self.condition.notify()
+            return self.next_token
+
+    # Returns True when the process was killed because it overran its deadline
+    def release(self, token):
+        with self.condition:
+            self.deadlines.pop(token, None)
+            if token in self.expired:
+                self.expired.discard(token)
+                return True
+            return False
+
+    def run(self):
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                for token, (deadline, process) in list(self.deadlines.items()):
+                    if deadline <= now:
+                        del self.deadlines[token]
+                        self.expired.add(token)
+                        kill_process_group(process)
+                next_deadline = min((deadline for deadline, _ in self.deadlines.values()), default=None)
+                self.condition.wait(None if next_deadline is None else next_deadline - now)
+
+
+_PARSER_WATCHDOG = None
+_PARSER_WATCHDOG_PID = None
+_PARSER_WATCHDOG_LOCK = threading.Lock()
+
+
+def get_parser_watchdog():
+    global _PARSER_WATCHDOG, _PARSER_WATCHDOG_PID
+    with _PARSER_WATCHDOG_LOCK:
+        # The watchdog thread does not survive a fork; each worker starts its own
+        if _PARSER_WATCHDOG_PID != os.getpid():
+            _PARSER_WATCHDOG = ParserWatchdog()
+            _PARSER_WATCHDOG_PID = os.getpid()
+        return _PARSER_WATCHDOG
+
+
+# Runs a one-shot parser process. Returns the CompletedProcess, or None when cancel_event was set
+# first. Raises ParserTimeout when it overran timeout seconds, and CalledProcessError on a
+# non-zero exit status when check is set.
+def run_parser_process(command, timeout, cancel_event=None, check=False):
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        start_new_session=True
+    )
+    watchdog = get_parser_watchdog()
+    token = watchdog.watch(process, timeout)
+    try:
+        stdout, stderr = communicate_unless_cancelled(process, cancel_event)
+    finally:
+        timed_out = watchdog.release(token)
 
+    if timed_out:
+        raise ParserTimeout(f"{os.path.basename(command[0])} did not finish within {timeout:.0f} seconds")
+    if stdout is None:
+        return None
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
 
-# Define parsing functions for different languages
 
-def parse_python_code(code):
-    error_handling_type = 'None'
+# Waits for a parser process, killing it if cancel_event is set first.
+# Returns (stdout, stderr), or (None, None) when the process was cancelled.
+def communicate_unless_cancelled(process, cancel_event):
+    if cancel_event is None:
+        return process.communicate()
+    while True:
+        try:
+            return process.communicate(timeout=0.1)
+        except subprocess.TimeoutExpired:
+            if cancel_event.is_set():
+                kill_process_group(process)
+                process.communicate()
+                return None, None
+
+
+# Long-lived parser daemons: each external parser runs in worker-server mode ("--server"),
+# reading one JSON request per line on stdin and answering with one JSON result line.
+# A daemon is started lazily the first time its language is needed in a worker process
+# and restarted if it crashes.
+
+class ParserDaemonError(Exception):
+    pass
+
+
+# Base command line of each external parser. Appending "--server" starts its worker-server mode
+# and "--manifest <file>" its batch mode.
+def parser_command(language):
+    if language == 'java':
+        return ['java', '-jar', str(Path('target/your-artifact-id-1.0-SNAPSHOT.jar').resolve())]
+    if language == 'kotlin':
+        return ['java', '-jar', os.path.abspath('parse_kotlin.jar')]
+    if language == 'csharp':
+        return ['dotnet', C_SHARP_PARSER_PATH]
+    if language == 'javascript':
+        return ['node', 'parse_javascript.js']
+    if language == 'typescript':
+        return ['node', 'parse_typescript.js']
+    if language == 'go':
+        return ['./parse_go_code/parse_go_code']
+    if language == 'ruby':
+        return ['ruby', 'parse_ruby.rb']
+    return None
+
+
+DAEMON_LANGUAGES = {'java', 'kotlin', 'csharp', 'javascript', 'typescript', 'go'}
+BATCH_LANGUAGES = DAEMON_LANGUAGES | {'go', 'ruby'}
+
+
+class ParserDaemon:
+    def __init__(self, language, command):
+        self.language = language
+        self.command = command
+        self.process = None
+        self.unavailable = False
+        self.served = 0
+        self.lock = threading.Lock()
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        logging.info(f"Starting {self.language} parser daemon: {' '.join(self.command)}")
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            start_new_session=True
+        )
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            kill_process_group(self.process)
+            self.process.wait()
+        self.process = None
+
+    # Raises ParserTimeout, after stopping the daemon, when no answer came within timeout seconds
+    def request(self, payload, timeout=None):
+        line = json.dumps(payload) + '\n'
+        with self.lock:
+            # One restart per request: a daemon that dies again straight away is treated as unavailable
+            for attempt in range(2):
+                token = None
+                try:
+                    if not self.is_running():
+                        self.start()
+                    if timeout is not None:
+                        token = get_parser_watchdog().watch(self.process, timeout)
+                    self.process.stdin.write(line)
+                    self.process.stdin.flush()
+                    response = self.process.stdout.readline()
+                except (OSError, ValueError) as e:
+                    logging.error(f"{self.language} parser daemon I/O error: {e}")
+                    response = ''
+
+                # A request that hangs would hang again after a restart, so it is not retried
+                if token is not None and get_parser_watchdog().release(token):
+                    self.stop()
+                    raise ParserTimeout(f"{self.language} parser did not answer within {timeout:.0f} seconds")
+
+                if response:
+                    try:
+                        decoded = json.loads(response)
+                    except json.JSONDecodeError:
+                        logging.error(f"{self.language} parser daemon sent invalid output: {response.strip()[:200]}")
+                    else:
+                        self.served += 1
+                        return decoded
+
+                logging.warning(f"{self.language} parser daemon failed (attempt {attempt + 1}); restarting")
+                self.stop()
+
+            # A daemon that never answered anything cannot be started on this machine
+            if self.served == 0:
+                self.unavailable = True
+        raise ParserDaemonError(f"{self.language} parser daemon is not responding")
+
+
+# Each process keeps a pool of daemons per language so that analysis threads can parse in
+# parallel; a daemon serves one thread at a time
+_PARSER_DAEMONS = {}
+_IDLE_PARSER_DAEMONS = {}
+_UNAVAILABLE_DAEMON_LANGUAGES = set()
+_PARSER_DAEMONS_PID = None
+_PARSER_DAEMONS_LOCK = threading.Lock()
+
+
+def reset_parser_daemons_after_fork():
+    global _PARSER_DAEMONS_PID
+    # Daemons belong to the process that started them; a forked worker starts its own
+    if _PARSER_DAEMONS_PID != os.getpid():
+        _PARSER_DAEMONS.clear()
+        _IDLE_PARSER_DAEMONS.clear()
+        _UNAVAILABLE_DAEMON_LANGUAGES.clear()
+        _PARSER_DAEMONS_PID = os.getpid()
+
+
+@contextmanager
+def checkout_parser_daemon(language):
+    with _PARSER_DAEMONS_LOCK:
+        reset_parser_daemons_after_fork()
+        if language not in DAEMON_LANGUAGES or language in _UNAVAILABLE_DAEMON_LANGUAGES:
+            daemon = None
+        elif _IDLE_PARSER_DAEMONS.get(language):
+            daemon = _IDLE_PARSER_DAEMONS[language].pop()
+        else:
+            daemon = ParserDaemon(language, parser_command(language) + ['--server'])
+            _PARSER_DAEMONS.setdefault(language, []).append(daemon)
+
     try:
-        tree = ast.parse(code)
-    except SyntaxError as e:
-        logging.error(f"SyntaxError: Invalid Python code. Detail: {str(e)}")
-        return error_handling_type  # Return early if the code cannot be parsed
-
-    class ErrorHandlingVisitor(ast.NodeVisitor):
-        def __init__(self):
-            self.has_basic_handling = False
-            self.has_advanced_handling = False
-
-        def visit_Try(self, node):
-            self.has_basic_handling = True
-            if self.has_advanced_handling:
-                return  # Stop traversal if both types are found
-            self.generic_visit(node)
-
-        def visit_ExceptHandler(self, node):
-            self.has_basic_handling = True
-            if self.has_advanced_handling:
-                return  # Stop traversal if both types are found
-            self.generic_visit(node)
-
-        def visit_Call(self, node):
-            if isinstance(node.func, ast.Name) and node.func.id.lower() in {"timeout", "retry", "circuitbreaker", "backoff"}:
-                self.has_advanced_handling = True
-            elif isinstance(node.func, ast.Attribute):
-                if node.func.attr.lower() in {'status_code', 'raise_for_status'}:
-                    self.has_basic_handling = True
-            
-            if self.has_basic_handling and self.has_advanced_handling:
-                return  # Stop traversal if both types are found
-            self.generic_visit(node)
-
-        def visit_With(self, node):
-            for item in node.items:
-                if isinstance(item.context_expr, ast.Call):
-                    if isinstance(item.context_expr.func, ast.Name) and item.context_expr.func.id.lower() in {"timeout", "retry", "circuitbreaker", "backoff"}:
-                        self.has_advanced_handling = True
-                        if self.has_basic_handling:
-                            return  # Stop traversal if both types are found
-            self.generic_visit(node)
-
-    visitor = ErrorHandlingVisitor()
-    visitor.visit(tree)
-
-    if visitor.has_basic_handling and visitor.has_advanced_handling:
-        error_handling_type = 'Both'
-    elif visitor.has_advanced_handling:
-        error_handling_type = 'Advanced'
-    elif visitor.has_basic_handling:
-        error_handling_type = 'Basic'
+        yield daemon
+    finally:
+        if daemon is not None:
+            with _PARSER_DAEMONS_LOCK:
+                if daemon.unavailable:
+                    if language not in _UNAVAILABLE_DAEMON_LANGUAGES:
+                        logging.error(f"{language} parser daemon is unavailable in this process; its files are "
+                                      f"parsed without it (rebuild the parser if it lacks \"--server\")")
+                    _UNAVAILABLE_DAEMON_LANGUAGES.add(language)
+                else:
+                    _IDLE_PARSER_DAEMONS.setdefault(language, []).append(daemon)
+
+
+def shutdown_parser_daemons():
+    if _PARSER_DAEMONS_PID != os.getpid():
+        return
+    with _PARSER_DAEMONS_LOCK:
+        for daemons in _PARSER_DAEMONS.values():
+            for daemon in daemons:
+                daemon.stop()
+        _PARSER_DAEMONS.clear()
+        _IDLE_PARSER_DAEMONS.clear()
+
+
+atexit.register(shutdown_parser_daemons)
+
+
+# Sends one request to the language's daemon. Returns the decoded response, or None when the
+# caller should fall back to a one-shot parser process (daemons disabled or not available).
+# Raises ParserTimeout when the daemon did not answer within the request's time budget.
+def request_daemon(language, payload):
+    if not SETTINGS['use_parser_daemons']:
+        return None
 
-    return error_handling_type
+    with checkout_parser_daemon(language) as daemon:
+        if daemon is None:
+            return None
+        if 'code' in payload:
+            input_bytes = len(payload['code'])
+        else:
+            try:
+                input_bytes = os.path.getsize(payload['path'])
+            except OSError:
+                input_bytes = 0
+        try:
+            return daemon.request(payload, parser_timeout(language, input_bytes))
+        except ParserDaemonError as e:
+            logging.error(f"{language} parser daemon failed, falling back to one-shot parsing: {e}")
+            return None
 
 
-def preprocess_java_code(code):
-    # Remove BOM and normalize Unicode
-    code = code.replace('\ufeff', '')
-    code = unicodedata.normalize('NFKC', code)
-    code = code.encode('utf-16', 'surrogatepass').decode('utf-16')
+def parse_with_daemon(language, payload):
+    try:
+        response = request_daemon(language, payload)
+    except ParserTimeout as e:
+        logging.error(f"{language} parsing timed out: {e}")
+        return TIMEOUT_RESULT
+    if response is None:
+        return None
 
-    # Additional preprocessing to handle problematic annotations
-    code = re.sub(r'@(\w+)\s*(\([^)]*\))?\s*(?=class|interface|enum|@interface)', r'/* @\1\2 */', code)
-    
-    # Normalize line endings
-    code = code.replace('\r\n', '\n').replace('\r', '\n')
-    code = code.replace('\u2028', '\n').replace('\u2029', '\n')
+    if 'error' in response:
+        logging.error(f"{language} parser daemon reported an error: {response['error']}")
+        return 'None'
+
+    return get_error_handling_type(
+        response.get('hasBasicHandling', False),
+        response.get('hasAdvancedHandling', False)
+    )
+
+
+# Runs one external parser over all files of a language with a single parser call. The parser
+# reads the files in place: through the language's daemon when one is available, otherwise
+# through one batch-mode invocation. Files the parser rejects because they are not UTF-8 are
+# decoded here and re-parsed through the code-string API; rejected Java files are re-parsed
+# preprocessed instead when java_preprocess_fallback is on. Files the batch call gave no result for
+# are parsed one file per call. Returns {file_path: error_handling_type}, with 'Timeout' for files
+# the parser did not finish within its time budget.
+# Setting cancel_event stops the call early; files that were not parsed are left out of the result.
+def parse_files_batch(language, file_paths, cancel_event=None):
+    results = {}
+    failed = []
+    pending = list(file_paths)
+
+    if language in DAEMON_LANGUAGES:
+        for index, file_path in enumerate(pending):
+            if cancel_event is not None and cancel_event.is_set():
+                return results
+            try:
+                response = request_daemon(language, {'path': os.path.abspath(file_path)})
+            except ParserTimeout as e:
+                logging.error(f"{language} parser timed out on {file_path}: {e}")
+                results[file_path] = TIMEOUT_RESULT
+                continue
+            if response is None:
+                pending = pending[index:]
+                break
+            if 'error' in response:
+                logging.error(f"{language} parser failed on {file_path}: {response['error']}")
+                results[file_path] = 'None'
+                failed.append(file_path)
+                continue
+            results[file_path] = get_error_handling_type(
+                response.get('hasBasicHandling', False),
+                response.get('hasAdvancedHandling', False)
+            )
+        else:
+            pending = []
 
-    # Remove invalid control characters
-    code = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', code)
+    if pending:
+        batch_results, batch_failed = run_batch_parser(language, pending, cancel_event)
+        results.update(batch_results)
+        failed.extend(batch_failed)
 
-    # Standardize quote characters
-    code = code.replace('’', "'").replace('“', '"').replace('”', '"')
-    
-    code = re.sub(r'("(?:[^"\\]|\\.)*$)', r'\1"', code)  # Close unclosed double quotes
-    code = re.sub(r"('(?:[^'\\]|\\.)*$)", r"\1'", code)  # Close unclosed single quotes
+        # A parser built before batch mode existed, or one that crashed, leaves files without a
+        # result; they are parsed one file per call, the way every file was parsed before
+        unparsed = [file_path for file_path, result in batch_results.items() if result is None]
+        if unparsed:
+            logging.error(f"{language} batch parser gave no result for {len(unparsed)} files; "
+                          f"parsing them one file per call (rebuild the parser if it lacks batch mode)")
+            for file_path in unparsed:
+                if cancel_event is not None and cancel_event.is_set():
+                    del results[file_path]
+                    continue
+                results[file_path] = parse_file(CODE_PARSERS[language], file_path)
 
-    # Handle hash selectively (e.g., color codes)
-    code = re.sub(r'#([0-9A-Fa-f]{6}|[0-9A-Fa-f]{3})(?!\w)', r'COLOR_\1', code)
+    count_metric('parser_failures', language, 'rejected', len(failed))
 
-    # Escape special characters and balance quotes
-    code = re.sub(r'\\u([0-9A-Fa-f]{4})', lambda m: '\\u' + m.group(1).upper(), code)  # Normalize Unicode escapes to uppercase
-    code = re.sub(r'"(.*?)"', lambda m: '"' + m.group(1).replace('#', '\\#').replace('\n', '\\n') + '"', code)
-    code = re.sub(r'(\\*)"', lambda m: '@@QUOTE@@' if len(m.group(1)) % 2 == 0 else m.group(0), code)
-    code = re.sub(r"(\\*)'", lambda m: "@@SINGLE_QUOTE@@" if len(m.group(1)) % 2 == 0 else m.group(0), code)
-    code = re.sub(r'(\\+)', r'\\\\', code)
+    for file_path in failed:
+        if language == 'java' and SETTINGS['java_preprocess_fallback']:
+            results[file_path] = parse_file(parse_preprocessed_java_code, file_path)
+        elif not is_utf8_file(file_path):
+            results[file_path] = parse_file(CODE_PARSERS[language], file_path)
 
-    # Handle emojis and symbols
-    code = re.sub(r'[^\x00-\x7F]', lambda x: f'\\u{ord(x.group(0)):04x}', code)
+    return results
 
-    # Normalize block comments
-    code = re.sub(r'/\*.*?\*/', '/* */', code, flags=re.DOTALL)
-    code = re.sub(r'/\*.*$', '/* */', code, flags=re.DOTALL)
 
-    # Remove line comments
-    code = re.sub(r'//.*$', '', code, flags=re.MULTILINE)
-    code = re.sub(r'/\*.*?\*/', '', code, flags=re.DOTALL)
+# Longest file list passed as "--batch" arguments; larger groups go through a manifest file
+BATCH_ARGUMENT_LIMIT = 32 * 1024
 
-    # Handle unescaped line breaks in strings
-    def replace_newlines(match):
-        return match.group(1) + match.group(2) + match.group(3).replace('\n', '\\n') + match.group(4) + match.group(2)
 
-    code = re.sub(r'([^\\])(["\'`])(.*?)\n(.*?)\2', replace_newlines, code, flags=re.DOTALL)
-    
+# A batch that overruns its time budget is re-run one file at a time, so that only the files
+# the parser actually hangs on are recorded as 'Timeout'.
+def run_batch_parser(language, file_paths, cancel_event=None):
+    results = dict.fromkeys(file_paths)
+    failed = []
+    absolute_paths = {os.path.abspath(file_path): file_path for file_path in file_paths}
+    manifest_path = None
+    timed_out = False
+
+    try:
+        if sum(len(path) + 1 for path in absolute_paths) <= BATCH_ARGUMENT_LIMIT:
+            command = parser_command(language) + ['--batch'] + list(absolute_paths)
+        else:
+            manifest_path = write_temp_file('\n'.join(absolute_paths), '.txt')
+            command = parser_command(language) + ['--manifest', manifest_path]
+
+        input_bytes = 0
+        for file_path in absolute_paths:
+            try:
+                input_bytes += os.path.getsize(file_path)
+            except OSError:
+                pass
+        result = run_parser_process(command, parser_timeout(language, input_bytes), cancel_event, check=True)
+        if result is None:
+            logging.info(f"{language} batch parser cancelled")
+            return {}, []
+
+        entries = json.loads(result.stdout)
+        # Anything but a list of result objects (a build without batch mode answers with one
+        # "true,false" line) is a failed call
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+            raise json.JSONDecodeError('expected a JSON array of results', result.stdout, 0)
+        for entry in entries:
+            file_path = absolute_paths.get(entry.get('path'))
+            if file_path is None:
+                continue
+            if 'error' in entry:
+                logging.error(f"{language} parser failed on {file_path}: {entry['error']}")
+                results[file_path] = 'None'
+                failed.append(file_path)
+                continue
+            results[file_path] = get_error_handling_type(
+                entry.get('hasBasicHandling', False),
+                entry.get('hasAdvancedHandling', False)
+            )
+        # A short reply leaves files at None; parse_files_batch parses them one file per call
+        missing = sum(file_result is None for file_result in results.values())
+        if missing:
+            logging.error(f"{language} batch parser returned {len(entries)} results for {len(file_paths)} files; "
+                          f"{missing} files have none")
+            count_metric('parser_failures', language, 'bad_output')
+
+    except ParserTimeout as e:
+        logging.error(f"{language} batch parser timed out on {len(file_paths)} files: {e}")
+        timed_out = True
+    except subprocess.CalledProcessError as e:
+        logging.error(f"{language} batch parser failed with exit code {e.returncode}. STDERR: {e.stderr.strip()}")
+        count_metric('parser_failures', language, 'exit_status')
+    except json.JSONDecodeError as e:
+        logging.error(f"Error parsing {language} batch parser output: {e}")
+        count_metric('parser_failures', language, 'bad_output')
+    except Exception as e:
+        logging.error(f"{language} batch parsing failed: {str(e)}")
+        count_metric('parser_failures', language, 'exception')
+    finally:
+        if manifest_path and os.path.exists(manifest_path):
+            try:
+                os.remove(manifest_path)
+            except Exception as e:
+                logging.error(f"Error removing manifest file: {str(e)}")
+
+    if timed_out and len(file_paths) == 1:
+        results[file_paths[0]] = TIMEOUT_RESULT
+    elif timed_out:
+        results, failed = {}, []
+        for file_path in file_paths:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            file_results, file_failed = run_batch_parser(language, [file_path], cancel_event)
+            results.update(file_results)
+            failed.extend(file_failed)
+
+    return results, failed
+
+
+def is_utf8_file(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            f.read().decode('utf-8')
+        return True
+    except UnicodeDecodeError:
+        return False
+    except OSError:
+        return True
+
+
+def parse_file(parser, file_path):
+    try:
+        return parser(read_text_file(file_path))
+    except FileNotFoundError:
+        logging.warning(f"File not found when trying to open: {file_path}")
+    except Exception as e:
+        logging.error(f"Unexpected error processing file {file_path}: {str(e)}")
+    return 'None'
 
-    # Remove unwanted symbols (e.g., "So" category in Unicode)
-    code = re.sub(r'[^\w\s#@,"\'(){}[\]<>;.:*/+=-]', '', code)
 
-    # Ensure the code ends with a newline
+# Define parsing functions for different languages
+
+# Python rules. Every node the analyzer looks for needs one of these words in the source, so a
+# file without them is 'None' without being parsed, and the walk stops once every flag whose
+# words occur has been found.
+PYTHON_ADVANCED_CALL_NAMES = {"timeout", "retry", "circuitbreaker", "backoff"}
+PYTHON_BASIC_ATTRIBUTE_NAMES = {'status_code', 'raise_for_status'}
+PYTHON_TRY_NODES = (ast.Try, ast.ExceptHandler) + ((ast.TryStar,) if hasattr(ast, 'TryStar') else ())
+PYTHON_BASIC_WORDS_PATTERN = re.compile(r'\b(?:try|except)\b|(?i:\b(?:status_code|raise_for_status)\b)')
+PYTHON_ADVANCED_WORDS_PATTERN = re.compile(r'(?i)\b(?:timeout|retry|circuitbreaker|backoff)\b')
+
+
+# Returns (has_basic_handling, has_advanced_handling); raises SyntaxError on invalid code
+def analyze_python_code(code):
+    may_have_basic = PYTHON_BASIC_WORDS_PATTERN.search(code) is not None
+    may_have_advanced = PYTHON_ADVANCED_WORDS_PATTERN.search(code) is not None
+    if not (may_have_basic or may_have_advanced):
+        return False, False
+
+    has_basic_handling = False
+    has_advanced_handling = False
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, PYTHON_TRY_NODES):
+            has_basic_handling = True
+        elif isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name):
+                if func.id.lower() in PYTHON_ADVANCED_CALL_NAMES:
+                    has_advanced_handling = True
+            elif isinstance(func, ast.Attribute) and func.attr.lower() in PYTHON_BASIC_ATTRIBUTE_NAMES:
+                has_basic_handling = True
+        else:
+            continue
+        if (has_basic_handling or not may_have_basic) and (has_advanced_handling or not may_have_advanced):
+            break
+
+    return has_basic_handling, has_advanced_handling
+
+
+def parse_python_code(code):
+    try:
+        has_basic_handling, has_advanced_handling = analyze_python_code(code)
+    except SyntaxError as e:
+        logging.error(f"SyntaxError: Invalid Python code. Detail: {str(e)}")
+        return 'None'
+    except RecursionError:
+        logging.error("Python code is nested too deeply to parse")
+        return 'None'
+
+    return get_error_handling_type(has_basic_handling, has_advanced_handling)
+
+
+# Java preprocessing: one tokenizer pass over the source. Comments, string/char literals and
+# text blocks are recognized together, so each rewrite only applies where it is valid Java:
+# comments are dropped (keeping their line breaks), literals are closed at the end of their
+# line and their non-ASCII characters escaped, and stray symbols outside literals are removed.
+JAVA_SOURCE_TRANSLATION = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), *range(0x7F, 0xA0)])
+JAVA_SOURCE_TRANSLATION.update({0xFEFF: None, ord('\r'): '\n', 0x2028: '\n', 0x2029: '\n'})
+JAVA_SURROGATE_PATTERN = re.compile('[\ud800-\udfff]')
+JAVA_NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7f]')
+# The leading lookahead lets the scan skip plain code without trying every alternative; the
+# literal and comment bodies are unrolled loops so long ones are consumed without backtracking
+JAVA_TOKEN_PATTERN = re.compile(
+    r'(?=["\'/@#]|[^\x00-\x7f])(?:'
+    r'(?P<text_block>"""[^"\\]*(?:(?:\\[\s\S]|"(?!""))[^"\\]*)*(?:""")?)'
+    r'|(?P<string>"[^"\\\n]*(?:\\.?[^"\\\n]*)*"?)'
+    r'|(?P<smart_string>[“”][^"“”\\\n]*(?:\\.?[^"“”\\\n]*)*["“”]?)'
+    r"|(?P<char>'[^'\\\n]*(?:\\.?[^'\\\n]*)*'?)"
+    r"|(?P<smart_char>[‘’][^'‘’\\\n]*(?:\\.?[^'‘’\\\n]*)*['‘’]?)"
+    r'|(?P<block_comment>/\*[^*]*(?:\*(?!/)[^*]*)*(?:\*/)?)'
+    r'|(?P<line_comment>//[^\n]*)'
+    r'|(?P<annotation>@\w+\b\s*(?:\([^)]*\))?\s*(?=(?:class|interface|enum|@interface)\b))'
+    r'|(?P<color>#(?:[0-9A-Fa-f]{6}|[0-9A-Fa-f]{3})(?!\w))'
+    r'|(?P<non_ascii>[^\x00-\x7f]+))'
+)
+JAVA_LITERAL_QUOTES = {
+    'string': ('"', '"'),
+    'smart_string': ('"', '"“”'),
+    'char': ("'", "'"),
+    'smart_char': ("'", "'‘’")
+}
+
+
+def java_unicode_escape(char):
+    code_point = ord(char)
+    if code_point > 0xFFFF:
+        code_point -= 0x10000
+        return f'\\u{0xD800 + (code_point >> 10):04x}\\u{0xDC00 + (code_point & 0x3FF):04x}'
+    return f'\\u{code_point:04x}'
+
+
+def escape_java_literal(text):
+    if text.isascii():
+        return text
+    return JAVA_NON_ASCII_PATTERN.sub(lambda match: java_unicode_escape(match.group()), text)
+
+
+def preprocess_java_token(match):
+    kind = match.lastgroup
+    text = match.group()
+
+    if kind in JAVA_LITERAL_QUOTES:
+        quote, closing = JAVA_LITERAL_QUOTES[kind]
+        body = text[1:]
+        if body and body[-1] in closing and (len(body) - 1 - len(body[:-1].rstrip('\\'))) % 2 == 0:
+            body = body[:-1]
+        elif (len(body) - len(body.rstrip('\\'))) % 2:
+            body = body[:-1]  # drop the dangling backslash so the added quote closes the literal
+        return quote + escape_java_literal(body) + quote
+    if kind == 'text_block':
+        return escape_java_literal(text if text.endswith('"""') and len(text) >= 6 else text + '"""')
+    if kind == 'block_comment':
+        return ' ' + '\n' * text.count('\n')
+    if kind == 'line_comment':
+        return ''
+    if kind == 'annotation':
+        return '/* ' + text.rstrip().replace('*/', '* /') + ' */ '
+    if kind == 'color':
+        return 'COLOR_' + text[1:]
+    return ''.join(
+        java_unicode_escape(char) if ('_' + char).isidentifier() else ' ' if char.isspace() else ''
+        for char in text
+    )
+
+
+def preprocess_java_code(code):
+    code = code.replace('\r\n', '\n').translate(JAVA_SOURCE_TRANSLATION)
+    if not code.isascii():
+        code = unicodedata.normalize('NFKC', code)
+        if JAVA_SURROGATE_PATTERN.search(code):
+            code = code.encode('utf-16', 'surrogatepass').decode('utf-16')
+
+    code = JAVA_TOKEN_PATTERN.sub(preprocess_java_token, code)
+
     if not code.endswith('\n'):
         code += '\n'
 
     return code
 
 
-def parse_java_code(code, advanced_methods=None, basic_methods=None):
-    if advanced_methods is None:
-        advanced_methods = {"timeout", "retry", "circuitbreaker", "backoff"}
-    if basic_methods is None:
-        basic_methods = {"catch", "finally", "throw", "throws", "statuscode"}
+# Preprocessing only pays off for code JavaParser cannot parse as it is, so it is an opt-in
+# retry ([parsers] java_preprocess_fallback) instead of a step every file goes through.
+def parse_java_code(code):
+    error_handling_type = run_java_parser(code)
+    if error_handling_type is None and SETTINGS['java_preprocess_fallback']:
+        return parse_preprocessed_java_code(code)
+    return error_handling_type or 'None'
+
+
+def parse_preprocessed_java_code(code):
+    return run_java_parser(preprocess_java_code(code)) or 'None'
+
+
+# Runs JavaParser over a code string. Returns the error handling type, or None when
+# JavaParser rejected the code.
+def run_java_parser(code):
+    try:
+        response = request_daemon('java', {'code': code})
+    except ParserTimeout as e:
+        logging.error(f"Java parsing timed out: {e}")
+        return TIMEOUT_RESULT
+    if response is not None:
+        if 'error' in response:
+            logging.error(f"java parser daemon reported an error: {response['error']}")
+            return None
+        return get_error_handling_type(
+            response.get('hasBasicHandling', False),
+            response.get('hasAdvancedHandling', False)
+        )
 
     error_handling_type = 'None'
     temp_file_path = None
 
     try:
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.java', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(code)
+        temp_file_path = write_temp_file(code, '.java')
 
         jar_path = Path('target/your-artifact-id-1.0-SNAPSHOT.jar').resolve()
         
-        result = subprocess.run(
+        result = run_parser_process(
             ['java', '-jar', str(jar_path), temp_file_path],
-            capture_output=True,
-            text=True,
+            parser_timeout('java', len(code)),
             check=True
         )
 
         parsed_output = json.loads(result.stdout)
-        has_basic_handling = parsed_output.get('hasBasicHandling', False)
-        has_advanced_handling = parsed_output.get('hasAdvancedHandling', False)
-
-        if has_basic_handling and has_advanced_handling:
-            error_handling_type = 'Both'
-        elif has_basic_handling:
-            error_handling_type = 'Basic'
-        elif has_advanced_handling:
-            error_handling_type = 'Advanced'
+        error_handling_type = get_error_handling_type(
+            parsed_output.get('hasBasicHandling', False),
+            parsed_output.get('hasAdvancedHandling', False)
+        )
 
+    except ParserTimeout as e:
+        logging.error(f"Java parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except subprocess.CalledProcessError as e:
         logging.error(f"Error running JavaParser analyzer: {e.stderr}")
-        if e.stdout:
-            try:
-                parsed_output = json.loads(e.stdout)
-                has_basic_handling = parsed_output.get('hasBasicHandling', False)
-                has_advanced_handling = parsed_output.get('hasAdvancedHandling', False)
-                if has_basic_handling and has_advanced_handling:
-                    error_handling_type = 'Both'
-                elif has_basic_handling:
-                    error_handling_type = 'Basic'
-                elif has_advanced_handling:
-                    error_handling_type = 'Advanced'
-            except json.JSONDecodeError:
-                logging.error("Failed to parse partial results")
+        if not e.stdout:
+            return None
+        try:
+            parsed_output = json.loads(e.stdout)
+            error_handling_type = get_error_handling_type(
+                parsed_output.get('hasBasicHandling', False),
+                parsed_output.get('hasAdvancedHandling', False)
+            )
+        except json.JSONDecodeError:
+            logging.error("Failed to parse partial results")
     except json.JSONDecodeError as e:
         logging.error(f"Error parsing JavaParser output: {e}")
     except Exception as e:
@@ -302,7 +1456,7 @@ def parse_java_code(code, advanced_methods=None, basic_methods=None):
             except Exception as e:
                 logging.error(f"Error removing temporary file: {str(e)}")
 
-    return error_handling_type 
+    return error_handling_type
     
           
 
@@ -311,22 +1465,22 @@ def parse_java_code(code, advanced_methods=None, basic_methods=None):
 BABEL_PLUGINS = ['jsx', 'typescript', 'classProperties', 'objectRestSpread']
 
 def parse_javascript_code(code):
+
+    result = parse_with_daemon('javascript', {'code': code})
+    if result is not None:
+        return result
     error_handling_type = 'None'
     temp_file_path = None  # Temporary file path for cleanup
 
     try:
         # Create a temporary file for the JavaScript code
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.js', delete=False, encoding='utf-8') as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(code)  # Write JavaScript code to the temp file
+        temp_file_path = write_temp_file(code, '.js')  # Write JavaScript code to the temp file
 
         # Run the JavaScript parser with a timeout
-        result = subprocess.run(
+        result = run_parser_process(
             ['node', 'parse_javascript.js', temp_file_path],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=30  # Set a 30-second timeout
+            parser_timeout('javascript', len(code)),
+            check=True
         )
 
         # Parse the output from the Node.js script
@@ -342,8 +1496,9 @@ def parse_javascript_code(code):
         elif has_advanced_handling:
             error_handling_type = 'Advanced'
 
-    except subprocess.TimeoutExpired:
-        logging.error("JavaScript parsing timed out after 30 seconds")
+    except ParserTimeout as e:
+        logging.error(f"JavaScript parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except subprocess.CalledProcessError as e:
         logging.error(f"Error running Babel parser: {e.stderr}")
     except json.JSONDecodeError as e:
@@ -363,18 +1518,19 @@ def parse_javascript_code(code):
 
 
 def parse_typescript_code(code):
+
+    result = parse_with_daemon('typescript', {'code': code})
+    if result is not None:
+        return result
     error_handling_type = 'None'
     temp_file_path = None
 
     try:
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.ts', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(code)
+        temp_file_path = write_temp_file(code, '.ts')
 
-        result = subprocess.run(
+        result = run_parser_process(
             ['node', 'parse_typescript.js', temp_file_path],
-            capture_output=True,
-            text=True,
+            parser_timeout('typescript', len(code)),
             check=True
         )
 
@@ -389,6 +1545,9 @@ def parse_typescript_code(code):
         elif has_advanced_handling:
             error_handling_type = 'Advanced'
 
+    except ParserTimeout as e:
+        logging.error(f"TypeScript parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except subprocess.CalledProcessError as e:
         logging.error(f"Error running TypeScript parser: {e.stderr}")
         if e.stdout:
@@ -409,116 +1568,59 @@ def parse_typescript_code(code):
 
 
 def parse_go_code(code):
+    result = parse_with_daemon('go', {'code': code})
+    if result is not None:
+        return result
+
     error_handling_type = 'None'
-    has_basic_handling = False
-    has_advanced_handling = False
-   
+    temp_file_path = None
 
     try:
-        # Save the Go code to a temporary file in the integration_test directory
-        temp_file_path = os.path.join('integration_test', 'temp_go_code.go')
-        with open(temp_file_path, 'w') as f:
-            f.write(code)
-
-        # Log the path and check if the file exists
-        logging.info(f"Temp Go file created at: {temp_file_path}")
-        if not os.path.exists(temp_file_path):
-            logging.error("Temp Go file was not created.")
-            return error_handling_type
+        # Each call gets its own temp file, so concurrent workers never read each other's code
+        temp_file_path = write_temp_file(code, '.go')
 
         # Use subprocess to run the go/ast based parser
-        result = subprocess.run(
-            ['./parse_go_code/parse_go_code', temp_file_path],
-            capture_output=True, text=True
-        )
+        result = run_parser_process(parser_command('go') + [temp_file_path], parser_timeout('go', len(code)))
         output = result.stdout.strip()
 
-        # Log the exact output from the Go parser for debugging
-        logging.info(f"Go parser output: {output}")
-
         if not output:
             logging.error("Go parser returned empty output.")
             return error_handling_type
 
         try:
             has_basic_handling_str, has_advanced_handling_str = output.split(",")
-            has_basic_handling = has_basic_handling_str.lower() == "true"
-            has_advanced_handling = has_advanced_handling_str.lower() == "true"
         except ValueError:
             logging.error(f"Unexpected output format from Go parser: {output}")
             return error_handling_type
 
-        if has_basic_handling and has_advanced_handling:
-            error_handling_type = 'Both'
-        elif has_basic_handling:
-            error_handling_type = 'Basic'
-        elif has_advanced_handling:
-            error_handling_type = 'Advanced'
+        error_handling_type = get_error_handling_type(
+            has_basic_handling_str.lower() == "true",
+            has_advanced_handling_str.lower() == "true"
+        )
 
+    except ParserTimeout as e:
+        logging.error(f"Go parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except Exception as e:
         logging.error(f"Go parsing failed: {e}")
-        
-    """finally:
-        # Clean up the temporary file
-        if os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except OSError as e:
-                logging.error(f"Failed to remove temporary file {temp_file_path}: {e}")
-    """
-    return error_handling_type
-
-
-def parse_ruby_code(code):
-    error_handling_type = 'None'
-    temp_file_path = None
-    
-    with tempfile.NamedTemporaryFile(mode='w+', suffix='.rb', delete=False) as temp_file:
-        temp_file_path = temp_file.name
-        temp_file.write(code)
-
-    try:
-        result = subprocess.run(['ruby', 'parse_ruby.rb', temp_file_path], capture_output=True, text=True, check=True)
-
-        output = result.stdout.strip()
-        if not output:
-            logging.error("Ruby parsing failed: No output from parser")
-            return error_handling_type
-
-        has_basic_handling, has_advanced_handling = output.split(',')
-
-        if has_basic_handling == "true" and has_advanced_handling == "true":
-            error_handling_type = 'Both'
-        elif has_basic_handling == "true":
-            error_handling_type = 'Basic'
-        elif has_advanced_handling == "true":
-            error_handling_type = 'Advanced'
-
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Ruby parsing failed with exit code {e.returncode}. STDERR: {e.stderr.strip()}")
-    except Exception as e:
-        logging.error(f"Ruby parsing failed: {str(e)}")
     finally:
         if temp_file_path and os.path.exists(temp_file_path):
             try:
                 os.remove(temp_file_path)
-            except Exception as e:
-                logging.warning(f"Failed to remove temporary Ruby file {temp_file_path}: {str(e)}")
+            except OSError as e:
+                logging.error(f"Failed to remove temporary file {temp_file_path}: {e}")
 
     return error_handling_type
 
 
-
 def parse_ruby_code(code):
     error_handling_type = 'None'
     temp_file_path = None
     
-    with tempfile.NamedTemporaryFile(mode='w+', suffix='.rb', delete=False) as temp_file:
-        temp_file_path = temp_file.name
-        temp_file.write(code)
+    temp_file_path = write_temp_file(code, '.rb')
 
     try:
-        result = subprocess.run(['ruby', 'parse_ruby.rb', temp_file_path], capture_output=True, text=True, check=True)
+        result = run_parser_process(['ruby', 'parse_ruby.rb', temp_file_path], parser_timeout('ruby', len(code)), check=True)
 
         output = result.stdout.strip()
         if not output:
@@ -534,6 +1636,9 @@ def parse_ruby_code(code):
         elif has_advanced_handling == "true":
             error_handling_type = 'Advanced'
 
+    except ParserTimeout as e:
+        logging.error(f"Ruby parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except subprocess.CalledProcessError as e:
         logging.error(f"Ruby parsing failed with exit code {e.returncode}. STDERR: {e.stderr.strip()}")
     except Exception as e:
@@ -548,6 +1653,7 @@ def parse_ruby_code(code):
     return error_handling_type
 
 
+
 # Add a global flag to set the csharp parser path
 C_SHARP_PARSER_PATH = os.path.abspath("/Users/francisobeng/Developer/Web_Services/Web_Services/NEW_AST_WEBSERVFH/CSharpParser/bin/Release/net8.0/CSharpParser.dll")
 
@@ -559,17 +1665,18 @@ def parse_csharp_code(code):
         logging.error(f"C# parsing failed: '{C_SHARP_PARSER_PATH}' not found.")
         return error_handling_type
 
+    result = parse_with_daemon('csharp', {'code': code})
+    if result is not None:
+        return result
+
     try:
         # Create a temporary file with proper permissions in a secure location
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.cs', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(code)  
+        temp_file_path = write_temp_file(code, '.cs')
 
         # Execute the CSharpParser DLL
-        result = subprocess.run(
-            ['dotnet', C_SHARP_PARSER_PATH, temp_file_path], 
-            capture_output=True, 
-            text=True
+        result = run_parser_process(
+            ['dotnet', C_SHARP_PARSER_PATH, temp_file_path],
+            parser_timeout('csharp', len(code))
         )
 
         if result.returncode != 0:
@@ -591,6 +1698,9 @@ def parse_csharp_code(code):
         elif has_advanced_handling.lower() == "true":
             error_handling_type = 'Advanced'
 
+    except ParserTimeout as e:
+        logging.error(f"C# parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except Exception as e:
         logging.error(f"C# parsing failed: {e}")
     
@@ -623,15 +1733,17 @@ def parse_kotlin_code(code):
         logging.error("Java not found. Please ensure Java is installed and accessible.")
         return error_handling_type
 
-    with tempfile.NamedTemporaryFile(mode='w+', suffix='.kt', delete=False) as temp_file:
-        temp_file_path = temp_file.name
-        temp_file.write(code)
-        temp_file.close()
+    result = parse_with_daemon('kotlin', {'code': code})
+    if result is not None:
+        return result
+
+    temp_file_path = write_temp_file(code, '.kt')
 
     try:
-        result = subprocess.run(
-            ['java', '-jar', jar_path, temp_file_path], 
-            capture_output=True, text=True, check=True
+        result = run_parser_process(
+            ['java', '-jar', jar_path, temp_file_path],
+            parser_timeout('kotlin', len(code)),
+            check=True
         )
 
         output = result.stdout.strip()
@@ -653,6 +1765,9 @@ def parse_kotlin_code(code):
         elif has_advanced_handling == "true":
             error_handling_type = 'Advanced'
 
+    except ParserTimeout as e:
+        logging.error(f"Kotlin parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except subprocess.CalledProcessError as e:
         logging.error(f"Kotlin parsing failed with exit code {e.returncode}")
         logging.error(f"STDERR: {e.stderr.strip()}")
@@ -672,26 +1787,52 @@ def parse_kotlin_code(code):
 # Add a global flag to track if the sourcekitten tool was already checked
 SOURCEKITTEN_AVAILABLE = shutil.which('sourcekitten') is not None
 
+# Keywords looked for in the strings of the sourcekitten output; "do", "try" and "catch" must be
+# whole words, since as substrings they occur in nearly every identifier and path
+SWIFT_BASIC_KEYWORD_PATTERN = re.compile(r'\b(?:do|catch|try)\b|statuscode')
+SWIFT_ADVANCED_KEYWORD_PATTERN = re.compile(r'timeout|retry|circuitbreaker|backoff')
+
 def parse_swift_code(code):
+    error_handling_type = 'None'
+    temp_file_path = None
+
+    if not SOURCEKITTEN_AVAILABLE:
+        logging.error("Swift parsing failed: 'sourcekitten' is not installed and accessible.")
+        return error_handling_type
+
+    try:
+        temp_file_path = write_temp_file(code, '.swift')
+        log_sampled_debug("Temporary Swift file created at: %s", temp_file_path)
+        error_handling_type = parse_swift_file(temp_file_path)
+
+    except Exception as e:
+        logging.error(f"Swift parsing failed: {e}")
+
+    finally:
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+            except Exception as e:
+                logging.warning(f"Failed to remove temporary file {temp_file_path}: {e}")
+
+    return error_handling_type
+
+
+def parse_swift_file(file_path):
     global SOURCEKITTEN_AVAILABLE
     error_handling_type = 'None'
     has_basic_handling = False
     has_advanced_handling = False
-    temp_file_path = None
 
     try:
         if not SOURCEKITTEN_AVAILABLE:
             logging.error("Swift parsing failed: 'sourcekitten' is not installed and accessible.")
             return error_handling_type
 
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.swift', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(code)
-            temp_file.flush()
-
-        logging.info(f"Temporary Swift file created at: {temp_file_path}")
-
-        result = subprocess.run(['sourcekitten', 'structure', '--file', temp_file_path], capture_output=True, text=True)
+        result = run_parser_process(
+            ['sourcekitten', 'structure', '--file', file_path],
+            parser_timeout('swift', os.path.getsize(file_path))
+        )
 
         if result.returncode != 0:
             logging.error(f"Swift parsing failed with exit code {result.returncode}. STDERR: {result.stderr}")
@@ -707,8 +1848,10 @@ def parse_swift_code(code):
             logging.warning("Parse JSON output failed. Falling back to raw output analysis.")
             ast = result.stdout
 
-        def traverse(node):
-            nonlocal has_basic_handling, has_advanced_handling
+        # Iterative walk that stops as soon as both kinds of handling are found
+        stack = [ast]
+        while stack and not (has_basic_handling and has_advanced_handling):
+            node = stack.pop()
             if isinstance(node, dict):
                 if node.get('key.kind') == 'source.lang.swift.stmt.do':
                     has_basic_handling = True
@@ -716,55 +1859,353 @@ def parse_swift_code(code):
                     has_advanced_handling = True
                 if node.get('key.name') == 'statusCode':
                     has_basic_handling = True
-
-                for value in node.values():
-                    traverse(value)
+                stack.extend(node.values())
             elif isinstance(node, list):
-                for item in node:
-                    traverse(item)
+                stack.extend(node)
             elif isinstance(node, str):
                 # Fallback: check for keywords in raw string output
                 lower_node = node.lower()
-                if 'do' in lower_node or 'catch' in lower_node or 'try' in lower_node:
+                if SWIFT_BASIC_KEYWORD_PATTERN.search(lower_node):
                     has_basic_handling = True
-                if any(keyword in lower_node for keyword in ["timeout", "retry", "circuitbreaker", "backoff"]):
+                if SWIFT_ADVANCED_KEYWORD_PATTERN.search(lower_node):
                     has_advanced_handling = True
-                if 'statuscode' in lower_node:
-                    has_basic_handling = True
 
-        traverse(ast)
-
-        if has_basic_handling and has_advanced_handling:
-            error_handling_type = 'Both'
-        elif has_basic_handling:
-            error_handling_type = 'Basic'
-        elif has_advanced_handling:
-            error_handling_type = 'Advanced'
+        error_handling_type = get_error_handling_type(has_basic_handling, has_advanced_handling)
 
+    except ParserTimeout as e:
+        logging.error(f"Swift parsing timed out: {e}")
+        error_handling_type = TIMEOUT_RESULT
     except Exception as e:
         logging.error(f"Swift parsing failed: {e}")
 
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except Exception as e:
-                logging.warning(f"Failed to remove temporary file {temp_file.name}: {e}")
-
     return error_handling_type
 
 
+# In-process tree-sitter engine, selectable per language in the [engines] section of config.ini.
+# Each rule set mirrors the external parser of its language (JavaParserAnalyzer, parse_javascript.js,
+# parse_typescript.js, parse_go_code.go, parse_ruby.rb, CSharpParser, ParseKotlin.kt and the
+# sourcekitten structure walk); benchmarks/parser_parity.py compares the two engines on real files.
+PARSER_ENGINES = ('external', 'tree-sitter')
+# Swift uses the in-process engine unless configured otherwise: its external parser runs a
+# sourcekitten process per file, which made Swift-heavy repositories the slowest of a batch
+DEFAULT_PARSER_ENGINES = {'swift': 'tree-sitter'}
+ENGINE_LANGUAGES = ('java', 'javascript', 'typescript', 'go', 'ruby', 'csharp', 'kotlin', 'swift')
+TREE_SITTER_GRAMMARS = {
+    'java': ('tree_sitter_java', 'language'),
+    'javascript': ('tree_sitter_javascript', 'language'),
+    'typescript': ('tree_sitter_typescript', 'language_typescript'),
+    'go': ('tree_sitter_go', 'language'),
+    'ruby': ('tree_sitter_ruby', 'language'),
+    'csharp': ('tree_sitter_c_sharp', 'language'),
+    'swift': ('tree_sitter_swift', 'language'),
+}
+# JavaParser, Babel, go/parser and the Ruby parser gem reject invalid code, which the external
+# parsers report as no error handling; TypeScript, Roslyn and sourcekitten analyze what they can
+STRICT_GRAMMAR_LANGUAGES = {'java', 'javascript', 'go', 'ruby'}
+ADVANCED_CALL_NAMES = {'timeout', 'retry', 'circuitbreaker', 'backoff'}
+
+_TREE_SITTER_PARSERS = threading.local()
+
+
+def parser_engine(language):
+    return SETTINGS['parser_engines'].get(language, 'external')
+
+
+# File cache entries are kept apart per engine, since the engines may disagree on a file
+def cache_language(language):
+    engine = parser_engine(language)
+    if engine != 'external':
+        return f'{language}/{engine}'
+    # Files JavaParser rejects get a different result with the preprocessing retry
+    if language == 'java' and SETTINGS['java_preprocess_fallback']:
+        return 'java/preprocessed'
+    return language
+
+
+def tree_sitter_available(language):
+    # Kotlin's rules are plain substring checks and need no grammar
+    if language == 'kotlin':
+        return True
+    if tree_sitter is None or language not in TREE_SITTER_GRAMMARS:
+        return False
+    try:
+        importlib.import_module(TREE_SITTER_GRAMMARS[language][0])
+    except ImportError:
+        return False
+    return True
+
+
+# tree_sitter.Parser objects must not be shared between threads
+def get_tree_sitter_parser(language):
+    parsers = _TREE_SITTER_PARSERS.__dict__
+    parser = parsers.get(language)
+    if parser is None:
+        module_name, function_name = TREE_SITTER_GRAMMARS[language]
+        grammar = getattr(importlib.import_module(module_name), function_name)()
+        parser = tree_sitter.Parser(tree_sitter.Language(grammar))
+        parsers[language] = parser
+    return parser
+
+
+def node_text(node):
+    return node.text.decode('utf-8', 'replace') if node is not None else ''
+
+
+def java_node_flags(node):
+    if node.type in ('try_statement', 'try_with_resources_statement', 'catch_clause', 'throw_statement'):
+        return True, False
+    if node.type == 'throws' and node.parent.type == 'method_declaration':
+        return True, False
+    if node.type == 'method_invocation':
+        method_name = node_text(node.child_by_field_name('name')).lower()
+        if method_name in ADVANCED_CALL_NAMES:
+            return False, True
+        if method_name == 'statuscode':
+            return True, False
+    return False, False
+
+
+def javascript_node_flags(node):
+    if node.type == 'try_statement':
+        return True, False
+    if node.type == 'call_expression':
+        callee = node.child_by_field_name('function')
+        if callee is None:
+            return False, False
+        if callee.type == 'identifier' and node_text(callee) in ('timeout', 'retry', 'circuitBreaker', 'backoff'):
+            return False, True
+        if callee.type == 'member_expression' and node_text(callee.child_by_field_name('property')) == 'status':
+            return True, False
+    return False, False
+
+
+def go_node_flags(node):
+    if node.type == 'if_statement':
+        condition = node.child_by_field_name('condition')
+        if condition is not None and condition.type == 'binary_expression':
+            left = condition.child_by_field_name('left')
+            right = condition.child_by_field_name('right')
+            if (left is not None and left.type == 'identifier' and node_text(left) == 'err' and
+                    node_text(condition.child_by_field_name('operator')) == '!=' and
+                    right is not None and right.type == 'nil'):
+                return True, False
+    if node.type == 'call_expression':
+        callee = node.child_by_field_name('function')
+        if callee is not None and callee.type == 'selector_expression':
+            method_name = node_text(callee.child_by_field_name('field'))
+            basic = method_name in ('StatusCode', 'Code')
+            advanced = any(keyword in method_name for keyword in
+                           ('Timeout', 'Retry', 'CircuitBreaker', 'Backoff', 'Deadline', 'Failover'))
+            return basic, advanced
+    return False, False
+
+
+def ruby_node_flags(node):
+    if node.type in ('rescue', 'rescue_modifier'):
+        return True, False
+    if node.type == 'call':
+        method_name = node_text(node.child_by_field_name('method'))
+        if method_name in ADVANCED_CALL_NAMES:
+            return False, True
+        receiver = node.child_by_field_name('receiver')
+        if method_name == 'code' and receiver is not None:
+            receiver_name = receiver if receiver.type == 'identifier' else receiver.child_by_field_name('method')
+            if node_text(receiver_name) == 'response':
+                return True, False
+    return False, False
+
+
+def csharp_node_flags(node):
+    if node.type == 'try_statement':
+        return True, False
+    if node.type == 'invocation_expression':
+        expression = node_text(node.child_by_field_name('function'))
+        advanced = any(keyword in expression for keyword in ('timeout', 'retry', 'CircuitBreaker', 'backoff'))
+        return 'StatusCode' in expression, advanced
+    return False, False
+
+
+# sourcekitten's structure lists do statements and the names of calls and declarations
+def swift_node_flags(node):
+    if node.type == 'do_statement':
+        return True, False
+    if node.type == 'call_expression' and node.named_child_count:
+        name = node_text(node.named_children[0])
+    elif node.type in ('function_declaration', 'property_declaration'):
+        name = node_text(node.child_by_field_name('name'))
+    else:
+        return False, False
+    return name == 'statusCode', name in ('timeout', 'retry', 'CircuitBreaker', 'backoff')
+
+
+TREE_SITTER_RULES = {
+    'java': java_node_flags,
+    'javascript': javascript_node_flags,
+    'typescript': javascript_node_flags,
+    'go': go_node_flags,
+    'ruby': ruby_node_flags,
+    'csharp': csharp_node_flags,
+    'swift': swift_node_flags,
+}
+
+
+# source is any bytes-like object: bytes, a memoryview or an mmap
+def analyze_with_tree_sitter(language, source):
+    try:
+        if language == 'kotlin':
+            def contains(keyword):
+                return source.find(keyword) != -1
+            return get_error_handling_type(
+                (contains(b'try') and contains(b'catch')) or contains(b'response.code') or contains(b'response.statusCode'),
+                any(contains(keyword) for keyword in (b'timeout', b'retry', b'CircuitBreaker', b'backoff'))
+            )
+
+        root = get_tree_sitter_parser(language).parse(source).root_node
+        if language in STRICT_GRAMMAR_LANGUAGES and root.has_error:
+            return 'None'
+
+        node_flags = TREE_SITTER_RULES[language]
+        has_basic_handling = False
+        has_advanced_handling = False
+        pending_nodes = [root]
+        while pending_nodes:
+            node = pending_nodes.pop()
+            basic, advanced = node_flags(node)
+            has_basic_handling = has_basic_handling or basic
+            has_advanced_handling = has_advanced_handling or advanced
+            if has_basic_handling and has_advanced_handling:
+                break
+            pending_nodes.extend(node.children)
+
+        return get_error_handling_type(has_basic_handling, has_advanced_handling)
+    except Exception as e:
+        logging.error(f"tree-sitter analysis of {language} code failed: {e}")
+        return 'None'
+
+
+def parse_file_with_tree_sitter(language, file_path):
+    with open_source(file_path) as source:
+        return analyze_with_tree_sitter(language, source)
+
+
+# Path-based parsing API for files that already live on disk: the parsers read them in place,
+# without the temp-file copy the parse_*_code functions need for in-memory code.
+
+def parse_source_file(language, file_path):
+    return parse_files_batch(language, [file_path])[file_path] or 'None'
+
+
+def parse_python_file(file_path):
+    return parse_file(parse_python_code, file_path)
+
+
+def parse_java_file(file_path):
+    return parse_source_file('java', file_path)
+
+
+def parse_javascript_file(file_path):
+    return parse_source_file('javascript', file_path)
+
+
+def parse_typescript_file(file_path):
+    return parse_source_file('typescript', file_path)
+
+
+def parse_go_file(file_path):
+    return parse_source_file('go', file_path)
+
+
+def parse_ruby_file(file_path):
+    return parse_source_file('ruby', file_path)
+
+
+def parse_csharp_file(file_path):
+    return parse_source_file('csharp', file_path)
+
 
-@functools.lru_cache(maxsize=128)
-def clone_repo(repo_url, clone_path, retries=3, delay=5, backoff_factor=2):
+def parse_kotlin_file(file_path):
+    return parse_source_file('kotlin', file_path)
+
+
+EXTENSION_TO_LANGUAGE = {
+    '.py': 'python', '.java': 'java', '.js': 'javascript',
+    '.ts': 'typescript', '.go': 'go', '.php': 'php',
+    '.rb': 'ruby', '.cs': 'csharp', '.kt': 'kotlin',
+    '.swift': 'swift'
+}
+
+CODE_PARSERS = {
+    'python': parse_python_code,
+    'java': parse_java_code,
+    'javascript': parse_javascript_code,
+    'typescript': parse_typescript_code,
+    'go': parse_go_code,
+    'ruby': parse_ruby_code,
+    'csharp': parse_csharp_code,
+    'kotlin': parse_kotlin_code,
+    'swift': parse_swift_code
+}
+
+FILE_PARSERS = {
+    'python': parse_python_file,
+    'java': parse_java_file,
+    'javascript': parse_javascript_file,
+    'typescript': parse_typescript_file,
+    'go': parse_go_file,
+    'ruby': parse_ruby_file,
+    'csharp': parse_csharp_file,
+    'kotlin': parse_kotlin_file,
+    'swift': parse_swift_file
+}
+
+
+# 'full' clones the latest commit with every file. 'sparse' makes a blobless clone and checks out
+# only files with an analyzable extension, so images, datasets and archives are never downloaded.
+# 'objects' makes a bare blobless clone and fetches the same blobs into its object store; analysis
+# then streams them from git and no working tree is ever written.
+FETCH_MODES = ('full', 'sparse', 'objects')
+
+
+def clone_commands(repo_url, clone_path, settings=None):
+    settings = settings or SETTINGS
+    if settings['fetch_mode'] == 'sparse':
+        patterns = [f'*{ext}' for ext, language in EXTENSION_TO_LANGUAGE.items() if language in FILE_PARSERS]
+        # "name/**" alone would be anchored at the root (it has a slash); "**/" excludes it at any depth
+        patterns += [f'!**/{name}/**' for name in settings['pruned_directories']]
+        patterns += [f'/{name}' for name in GIT_RULE_FILES]
+        return [
+            ['git', 'clone', '--depth', '1', '--filter=blob:none', '--no-checkout', repo_url, clone_path],
+            ['git', '-C', clone_path, 'sparse-checkout', 'set', '--no-cone'] + patterns,
+            # Fetches the missing blobs of the checked-out files in one request
+            ['git', '-C', clone_path, 'checkout']
+        ]
+    if settings['fetch_mode'] == 'objects':
+        # An empty template skips the sample hooks, leaving only a handful of files to create and remove
+        return [['git', 'clone', '--bare', '--template=', '--depth', '1', '--filter=blob:none', repo_url, clone_path]]
+    return [['git', 'clone', '--depth', '1', repo_url, clone_path]]
+
+
+def clone_repo(repo_url, clone_path, retries=3, delay=5, backoff_factor=2, settings=None):
+    settings = settings or SETTINGS
     attempt = 0
     while attempt < retries:
         try:
-            if os.path.exists(clone_path):
+            # clone_path starts out as the empty directory fetch_repo reserved; git clones into
+            # it, so it is only emptied again when a failed attempt left something behind
+            if attempt > 0 and os.path.exists(clone_path):
                 cleanup_clone(clone_path)
+                os.makedirs(clone_path)
 
             logging.info(f"Cloning repository {repo_url}, attempt {attempt + 1}")
-            subprocess.run(['git', 'clone', '--depth', '1', repo_url, clone_path], check=True, capture_output=True, text=True, timeout=300)
+            for command in clone_commands(repo_url, clone_path, settings):
+                subprocess.run(command, check=True, capture_output=True, text=True, timeout=300)
+            if settings['fetch_mode'] == 'objects':
+                tree_blobs = list_tree_blobs(clone_path)
+                prefetch_blobs(clone_path, [
+                    blob_sha for file_path, blob_sha in tree_blobs.items()
+                    if candidate_language(os.path.relpath(file_path, clone_path), settings) or
+                    os.path.relpath(file_path, clone_path) in GIT_RULE_FILES
+                ])
             logging.info(f"Successfully cloned {repo_url}")
             return True
         except subprocess.CalledProcessError as e:
@@ -778,116 +2219,876 @@ def clone_repo(repo_url, clone_path, retries=3, delay=5, backoff_factor=2):
     logging.error(f"Failed to clone repository {repo_url} after {retries} attempts.")
     return False
 
-def analyze_code(repo_path):
-    error_handling_type = 'None'
-    exception_files = set()
-    languages_used = set()
+def get_remote_head_sha(repo_url):
+    try:
+        result = subprocess.run(
+            ['git', 'ls-remote', repo_url, 'HEAD'],
+            capture_output=True, text=True, check=True, timeout=60,
+            env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+        )
+    except subprocess.CalledProcessError as e:
+        logging.warning(f"git ls-remote failed for {repo_url}: {e.stderr.strip()}")
+        return None
+    except subprocess.TimeoutExpired:
+        logging.warning(f"git ls-remote timed out for {repo_url}")
+        return None
 
-    extension_to_language = {
-        '.py': 'python', '.java': 'java', '.js': 'javascript',
-        '.ts': 'typescript', '.go': 'go', '.php': 'php', 
-        '.rb': 'ruby', '.cs': 'csharp', '.kt': 'kotlin', 
-        '.swift': 'swift'
-    }
+    output = result.stdout.split()
+    return output[0] if output else None
 
-    language_parsers = {
-        'python': parse_python_code,
-        'java': parse_java_code,
-        'javascript': parse_javascript_code,
-        'typescript': parse_typescript_code,
-        'go': parse_go_code,
-        'ruby': parse_ruby_code,
-        'csharp': parse_csharp_code,
-        'kotlin': parse_kotlin_code,
-        'swift': parse_swift_code
-    }
 
-    files_to_analyze = [
-        os.path.join(root, file)
-        for root, _, files in os.walk(repo_path)
-        for file in files
-        if any(file.endswith(ext) for ext in extension_to_language.keys())
-    ]
+def is_bare_repository(path):
+    return os.path.isfile(os.path.join(path, 'HEAD')) and not os.path.exists(os.path.join(path, '.git'))
+
 
-    for file_path in files_to_analyze:
-        if not os.path.exists(file_path):
-            logging.warning(f"File not found: {file_path}")
+# Blob SHAs of the files in HEAD of a bare repository, keyed by the file's path joined to the
+# repository directory (the path it would have in a checkout there)
+def list_tree_blobs(git_dir):
+    result = subprocess.run(
+        ['git', '-C', git_dir, 'ls-tree', '-r', '-z', 'HEAD'],
+        capture_output=True, check=True
+    )
+    tree_blobs = {}
+    for entry in result.stdout.decode('utf-8', 'surrogateescape').split('\0'):
+        if not entry:
             continue
-        
-        
+        metadata, _, path = entry.partition('\t')
+        mode, object_type, blob_sha = metadata.split()
+        # Submodules (commit entries) and symlinks have no source to analyze
+        if object_type != 'blob' or mode == '120000':
+            continue
+        tree_blobs[os.path.normpath(os.path.join(git_dir, path))] = blob_sha
+    return tree_blobs
+
+
+# Downloads the given blobs into a blobless clone with one fetch, the way git itself backfills
+# missing objects of a partial clone
+def prefetch_blobs(git_dir, blob_shas):
+    blob_shas = '\n'.join(blob_shas)
+    if not blob_shas:
+        return
+    subprocess.run(
+        ['git', '-C', git_dir, '-c', 'fetch.negotiationAlgorithm=noop', 'fetch', 'origin', '--no-tags',
+         '--no-write-fetch-head', '--recurse-submodules=no', '--filter=blob:none', '--stdin'],
+        input=blob_shas + '\n', check=True, capture_output=True, text=True, timeout=300
+    )
+
+
+def get_blob_sizes(git_dir, blob_shas):
+    result = subprocess.run(
+        ['git', '-C', git_dir, 'cat-file', '--batch-check=%(objectname) %(objectsize)'],
+        input='\n'.join(blob_shas) + '\n', capture_output=True, text=True, check=True
+    )
+    blob_sizes = {}
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[1].isdigit():
+            blob_sizes[fields[0]] = int(fields[1])
+    return blob_sizes
+
+
+# Reads blob contents from a repository through one long-running "git cat-file --batch"
+class BlobReader:
+    def __init__(self, git_dir):
+        self.process = subprocess.Popen(
+            ['git', '-C', git_dir, 'cat-file', '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self.lock = threading.Lock()
+
+    def read(self, blob_sha):
+        with self.lock:
+            self.process.stdin.write(blob_sha.encode('ascii') + b'\n')
+            self.process.stdin.flush()
+            header = self.process.stdout.readline().split()
+            if len(header) != 3:
+                return None
+            data = self.process.stdout.read(int(header[2]))
+            self.process.stdout.read(1)
+            return data
+
+    def close(self):
         try:
-            with open_file(file_path) as f:
-                file_extension = os.path.splitext(file_path)[1]
-                language = extension_to_language.get(file_extension, "Unknown")
-                parser = language_parsers.get(language)
-            
-                if parser:
-                    code = f.read()
-                    result = parser(code)
-
-                    if result != 'None':
-                        exception_files.add(file_path)
-                        languages_used.add(language)
-                        if error_handling_type == 'None':
-                            error_handling_type = result
-                        elif error_handling_type == 'Basic' and result == 'Advanced':
-                            error_handling_type = 'Both'
-                        elif error_handling_type == 'Advanced' and result == 'Basic':
-                            error_handling_type = 'Both'
-
-        except FileNotFoundError:
-            logging.warning(f"File not found when trying to open: {file_path}")
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+
+
+# File discovery. Directories of dependencies, build output and VCS metadata are not descended
+# into, generated and minified files are skipped by name, files larger than max_file_size_kb are
+# skipped, and the root .gitignore and .gitattributes (linguist-vendored, linguist-generated,
+# linguist-documentation) are honoured.
+GIT_RULE_FILES = ('.gitignore', '.gitattributes')
+GENERATED_FILE_PATTERN = re.compile(
+    r'(?:[.-]min\.js|\.bundle\.js|\.d\.ts|_pb2\.py|\.pb\.go|_gen\.go|\.g\.cs|\.designer\.cs)$', re.IGNORECASE
+)
+LINGUIST_EXCLUDING_ATTRIBUTES = ('linguist-vendored', 'linguist-generated', 'linguist-documentation')
+
+
+def pruned_directory(relative_path, settings=None):
+    pruned_directories = (settings or SETTINGS)['pruned_directories']
+    parts = relative_path.replace(os.sep, '/').split('/')
+    for index, part in enumerate(parts[:-1]):
+        if part in pruned_directories:
+            return '/'.join(parts[:index + 1])
+    return None
+
+
+def candidate_language(relative_path, settings=None):
+    language = EXTENSION_TO_LANGUAGE.get(os.path.splitext(relative_path)[1])
+    if language not in FILE_PARSERS or pruned_directory(relative_path, settings):
+        return None
+    if GENERATED_FILE_PATTERN.search(relative_path):
+        return None
+    return language
+
+
+# Translates a .gitignore/.gitattributes pattern into a regex over '/'-separated relative paths
+# that also matches every path below a matching directory
+def compile_git_pattern(pattern):
+    directory_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/') if directory_only else pattern
+    # A leading or middle slash anchors the pattern at the repository root
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+            end = pattern.index(']', i + 1)
+            regex += '[' + pattern[i + 1:end].replace('!', '^', 1) + ']'
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+
+    prefix = '' if anchored else '(?:.*/)?'
+    suffix = '/.*' if directory_only else '(?:/.*)?'
+    return re.compile(f'^{prefix}{regex}{suffix}$')
+
+
+# Returns [(regex, excluded)] from the repository's root .gitignore and .gitattributes; the last
+# matching rule decides whether a path is excluded. read_text(name) returns a rule file or None.
+def load_git_rules(read_text):
+    rules = []
+    for line in (read_text('.gitignore') or '').splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
             continue
-    
-        
-        except UnicodeDecodeError:
-            logging.warning(f"Skipping file due to encoding issues: {file_path}")
+        negated = line.startswith('!')
+        rules.append((compile_git_pattern(line[1:] if negated else line), not negated))
+
+    for line in (read_text('.gitattributes') or '').splitlines():
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
             continue
-        
-        except Exception as e:
-            logging.error(f"Unexpected error processing file {file_path}: {str(e)}")
+        for attribute in fields[1:]:
+            name, _, value = attribute.lstrip('-!').partition('=')
+            if name in LINGUIST_EXCLUDING_ATTRIBUTES:
+                excluded = not attribute.startswith(('-', '!')) and value != 'false'
+                rules.append((compile_git_pattern(fields[0]), excluded))
+    return rules
+
+
+def is_excluded_by_rules(relative_path, rules):
+    excluded = False
+    for regex, rule_excludes in rules:
+        if regex.match(relative_path):
+            excluded = rule_excludes
+    return excluded
+
+
+# Yields (relative_path, file_path) for every file below repo_path, skipping pruned directories
+def scan_working_tree(repo_path, stats):
+    pending_directories = ['']
+    while pending_directories:
+        relative_directory = pending_directories.pop()
+        try:
+            entries = os.scandir(os.path.join(repo_path, relative_directory))
+        except OSError as e:
+            logging.warning(f"Cannot read directory {relative_directory or repo_path}: {e}")
+            continue
+        with entries:
+            for entry in entries:
+                relative_path = f'{relative_directory}/{entry.name}' if relative_directory else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SETTINGS['pruned_directories']:
+                        stats['pruned_directories'] += entry.name != '.git'
+                    else:
+                        pending_directories.append(relative_path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield relative_path, entry.path
+
+
+# Groups the analyzable files of a checkout, or of a bare repository's tree_blobs, by language.
+# Returns (files_by_language, stats) with counts of analyzed and skipped files.
+def discover_files(repo_path, tree_blobs=None, read_source=None):
+    stats = dict.fromkeys(('analyzed', 'pruned_directories', 'generated', 'ignored', 'oversized'), 0)
+    max_size = SETTINGS['max_file_size_kb'] * 1024
+
+    if tree_blobs is None:
+        def read_text(name):
+            try:
+                with open(os.path.join(repo_path, name), 'rb') as f:
+                    return decode_source(f.read())
+            except OSError:
+                return None
+        candidates = scan_working_tree(repo_path, stats)
+    else:
+        def read_text(name):
+            file_path = os.path.normpath(os.path.join(repo_path, name))
+            return decode_source(read_source(file_path) or b'') if file_path in tree_blobs else None
+        relative_paths = {file_path: os.path.relpath(file_path, repo_path).replace(os.sep, '/') for file_path in tree_blobs}
+        stats['pruned_directories'] = len({pruned_directory(relative_path) for relative_path in relative_paths.values()} - {None})
+        candidates = ((relative_path, file_path) for file_path, relative_path in relative_paths.items())
+
+    rules = load_git_rules(read_text) if SETTINGS['use_ignore_files'] else []
+
+    candidate_files = []
+    for relative_path, file_path in candidates:
+        if EXTENSION_TO_LANGUAGE.get(os.path.splitext(relative_path)[1]) not in FILE_PARSERS:
+            continue
+        language = candidate_language(relative_path)
+        if language is None:
+            # Files below pruned directories only appear in a tree listing and count with their directory
+            if not pruned_directory(relative_path):
+                stats['generated'] += 1
+            continue
+        if rules and is_excluded_by_rules(relative_path, rules):
+            stats['ignored'] += 1
             continue
+        candidate_files.append((file_path, language))
 
-    return error_handling_type, list(exception_files), list(languages_used)
+    if tree_blobs is None:
+        file_sizes = {}
+        for file_path, _ in candidate_files:
+            try:
+                file_sizes[file_path] = os.stat(file_path).st_size
+            except OSError:
+                file_sizes[file_path] = 0
+    else:
+        try:
+            blob_sizes = get_blob_sizes(repo_path, [tree_blobs[file_path] for file_path, _ in candidate_files]) if candidate_files else {}
+        except subprocess.CalledProcessError:
+            blob_sizes = {}
+        file_sizes = {file_path: blob_sizes.get(tree_blobs[file_path], 0) for file_path, _ in candidate_files}
+
+    files_by_language = {}
+    for file_path, language in candidate_files:
+        if max_size and file_sizes[file_path] > max_size:
+            stats['oversized'] += 1
+            continue
+        stats['analyzed'] += 1
+        files_by_language.setdefault(language, []).append(file_path)
 
+    return files_by_language, stats
 
 
-def process_repo(row, clone_dir):
-    try:
-        log_system_stats()
-        check_disk_usage()
+# Imports of retry/resilience libraries and HTTP clients. Files that have them are parsed first so
+# that the repository verdict reaches 'Both' as early as possible.
+RESILIENCE_IMPORT_PATTERN = re.compile(
+    rb'(?i)tenacity|retrying|backoff|resilience4j|polly|circuit.?breaker|retry'
+)
+HTTP_CLIENT_IMPORT_PATTERN = re.compile(
+    rb'(?i)requests|httpx|aiohttp|urllib3|axios|node-fetch|superagent|net/http|resty|okhttp|retrofit|feign|'
+    rb'httpclient|restsharp|faraday|httparty|alamofire|urlsession|ktor'
+)
+
+
+def file_priority(data):
+    head = data[:4096]
+    return 2 * bool(RESILIENCE_IMPORT_PATTERN.search(head)) + bool(HTTP_CLIENT_IMPORT_PATTERN.search(head))
+
+
+# Every token any parser's rules can react to, per language. A file without one of them cannot be
+# classified as anything but 'None', so the keyword prefilter settles it without parsing.
+# The patterns are supersets of the rules (substrings, not identifiers), so they never drop a file
+# a parser would flag. A pattern is case-sensitive only where every engine of its language matches
+# exact names; the external Swift parser lowercases the strings of the sourcekitten output.
+KEYWORD_PATTERNS = {
+    'python': re.compile(rb'(?i)try|timeout|retry|circuitbreaker|backoff|status_code|raise_for_status'),
+    'java': re.compile(rb'(?i)try|catch|throw|timeout|retry|circuitbreaker|backoff|statuscode'),
+    'javascript': re.compile(rb'try|timeout|retry|circuitBreaker|backoff|status'),
+    'typescript': re.compile(rb'try|timeout|retry|circuitBreaker|backoff|status'),
+    'go': re.compile(rb'err|Code|Timeout|Retry|CircuitBreaker|Backoff|Deadline|Failover'),
+    'ruby': re.compile(rb'rescue|retry|timeout|circuitbreaker|backoff|code'),
+    'csharp': re.compile(rb'try|timeout|retry|CircuitBreaker|backoff|StatusCode'),
+    'kotlin': re.compile(rb'try|timeout|retry|CircuitBreaker|backoff|response\.code|response\.statusCode'),
+    'swift': re.compile(rb'(?i)\bdo\b|try|catch|timeout|retry|circuitbreaker|backoff|statuscode'),
+}
+# UTF-16/32 text does not match byte patterns, so it is always parsed
+WIDE_ENCODING_BOMS = (b'\xff\xfe', b'\xfe\xff')
+# Files settled by the keyword prefilter and files passed on to a parser, in this process
+PREFILTER_STATS = {'skipped': 0, 'parsed': 0}
+
+
+def has_candidate_keywords(language, data):
+    keyword_pattern = KEYWORD_PATTERNS.get(language)
+    if keyword_pattern is None or data[:2] in WIDE_ENCODING_BOMS:
+        return True
+    return keyword_pattern.search(data) is not None
 
+
+
+
+# Parser work of a repository is fanned out to a per-process thread pool; the external parsers
+# run as subprocesses, so threads are enough. parse_python_code and the tree-sitter engine run
+# in-process and are CPU-bound: when a repository has more than one chunk of such files, they go
+# to the worker's parser process pool (see ParserProcesses).
+_ANALYSIS_EXECUTORS = {}
+_ANALYSIS_EXECUTORS_PID = None
+
+
+def get_analysis_executors():
+    global _ANALYSIS_EXECUTORS_PID
+    if _ANALYSIS_EXECUTORS_PID != os.getpid():
+        _ANALYSIS_EXECUTORS.clear()
+        _ANALYSIS_EXECUTORS_PID = os.getpid()
+        max_workers = SETTINGS['max_parallel_parsers']
+        _ANALYSIS_EXECUTORS['threads'] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='parser')
+    return _ANALYSIS_EXECUTORS
+
+
+def shutdown_analysis_executors():
+    if _ANALYSIS_EXECUTORS_PID != os.getpid():
+        return
+    for executor in _ANALYSIS_EXECUTORS.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _ANALYSIS_EXECUTORS.clear()
+
+
+atexit.register(shutdown_analysis_executors)
+
+
+def in_process_parser(language):
+    return language == 'python' or parser_engine(language) == 'tree-sitter'
+
+
+# Parser processes keep their log records and hand them back with the results of each chunk;
+# the worker then logs them as its own (see ParserProcesses.parse)
+class RecordCollector(QueueHandler):
+    def __init__(self):
+        super().__init__(None)
+        self.records = []
+
+    def enqueue(self, record):
+        self.records.append(record)
+
+    def drain(self):
+        records, self.records = self.records, []
+        return records
+
+
+_RECORD_COLLECTOR = None
+_CANCELLED_RUN = None
+
+
+# Initializer of the parser processes. They are spawned, not forked, so they start without the
+# worker's threads, log handlers or buffered log records.
+def init_parser_process(settings, cancelled_run):
+    global _RECORD_COLLECTOR, _CANCELLED_RUN
+    SETTINGS.update(settings)
+    _RECORD_COLLECTOR = RecordCollector()
+    logger = logging.getLogger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(_RECORD_COLLECTOR)
+    logger.setLevel(SETTINGS['log_level'])
+    _CANCELLED_RUN = cancelled_run
+
+
+# The cancel_event of parser process chunks: set once the worker cancelled their run
+class ParserRunCancelEvent:
+    def __init__(self, run_id):
+        self.run_id = run_id
+
+    def is_set(self):
+        return _CANCELLED_RUN.value >= self.run_id
+
+
+# Parses file_paths on disk, or sources ({file_path: code}) when given, in a parser process
+def parse_in_parser_process(run_id, language, file_paths, sources=None):
+    cancel_event = ParserRunCancelEvent(run_id)
+    if sources is None:
+        results = parse_files(language, file_paths, cancel_event)
+    else:
+        results = parse_sources(language, sources, cancel_event)
+    return results, _RECORD_COLLECTOR.drain()
+
+
+# Every worker keeps one pool of parser processes for its lifetime. Processes are started as
+# chunks need them, up to max_parallel_parsers, and parallelism across workers stays within the
+# shared parse slots. A worker analyzes one repository at a time, so its runs (one per
+# analyze_code call) are numbered, and cancelling a run stops its chunks at their next file.
+class ParserProcesses:
+    def __init__(self, max_workers):
+        context = multiprocessing.get_context('spawn')
+        # Only the worker writes it, so it needs no lock
+        self.cancelled_run = context.RawValue('Q', 0)
+        self.last_run = 0
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=context,
+            initializer=init_parser_process, initargs=(dict(SETTINGS), self.cancelled_run)
+        )
+
+    def start_run(self):
+        self.last_run += 1
+        return self.last_run
+
+    def cancel_run(self, run_id):
+        self.cancelled_run.value = max(self.cancelled_run.value, run_id)
+
+    def parse(self, run_id, language, file_paths, sources=None):
+        future = self.executor.submit(parse_in_parser_process, run_id, language, file_paths, sources)
+        results, records = future.result()
+        logger = logging.getLogger()
+        for record in records:
+            logger.handle(record)
+        return results
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+_PARSER_PROCESSES = None
+
+
+# Holds one slot of the budget shared by all worker processes while a parser runs, so that
+# repository-level and file-level parallelism together stay within max_parallel_parsers
+def parse_slot():
+    return PARSE_SLOTS if PARSE_SLOTS is not None else nullcontext()
+
+
+def parse_files(language, file_paths, cancel_event=None):
+    tree_sitter_engine = parser_engine(language) == 'tree-sitter'
+    if language in BATCH_LANGUAGES and not tree_sitter_engine:
+        return parse_files_batch(language, file_paths, cancel_event)
+
+    results = {}
+    for file_path in file_paths:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        if tree_sitter_engine:
+            results[file_path] = parse_file_with_tree_sitter(language, file_path)
+        else:
+            results[file_path] = FILE_PARSERS[language](file_path)
+    return results
+
+
+# Parses sources held in memory ({file_path: code}); the tree-sitter engine also takes bytes
+def parse_sources(language, sources, cancel_event=None):
+    results = {}
+    for file_path, code in sources.items():
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        try:
+            if parser_engine(language) == 'tree-sitter':
+                source = code if isinstance(code, bytes) else code.encode('utf-8', 'surrogatepass')
+                results[file_path] = analyze_with_tree_sitter(language, source)
+            else:
+                results[file_path] = CODE_PARSERS[language](code)
+        except Exception as e:
+            logging.error(f"Unexpected error processing file {file_path}: {str(e)}")
+            results[file_path] = 'None'
+    return results
+
+
+# read_source(file_path) -> bytes switches from parsing files on disk to parsing their contents.
+# parse_in_process(language, file_paths, sources=None), when given, runs the in-process parsers
+# in a parser process (see ParserProcesses.parse); the external ones stay on this thread.
+def parse_files_chunk(language, file_paths, cancel_event, read_source=None, parse_in_process=None):
+    with parse_slot():
+        if cancel_event.is_set():
+            return {}
+        with stage_timer('parse', language):
+            if not in_process_parser(language):
+                parse_in_process = None
+
+            if read_source is None:
+                if parse_in_process is not None:
+                    return parse_in_process(language, file_paths)
+                return parse_files(language, file_paths, cancel_event)
+
+            # The tree-sitter engine parses the bytes as they are; the other parsers take text
+            tree_sitter_engine = parser_engine(language) == 'tree-sitter'
+            sources = {}
+            for file_path in file_paths:
+                if cancel_event.is_set():
+                    return {}
+                data = read_source(file_path) or b''
+                sources[file_path] = data if tree_sitter_engine else decode_source(data)
+            if parse_in_process is not None:
+                return parse_in_process(language, file_paths, sources)
+            return parse_sources(language, sources, cancel_event)
+
+
+# Unless full_scan is set (default: [analysis] full_scan), analysis stops dispatching parser work
+# as soon as the verdict is 'Both', since no further file can change it. exception_files is then
+# partial; a full scan returns every file with exception handling. timed_out_files lists the files
+# whose parser overran its time budget and, when [timeouts] repo_deadline passed, every file
+# that was still waiting to be parsed.
+def analyze_code(repo_path, full_scan=None):
+    if full_scan is None:
+        full_scan = SETTINGS['full_scan']
+
+    deadline = time.monotonic() + SETTINGS['repo_deadline'] if SETTINGS['repo_deadline'] > 0 else None
+    error_handling_type = 'None'
+    exception_files = set()
+    timed_out_files = set()
+    languages_used = set()
+    cancel_event = threading.Event()
+    # Chunks in the worker's parser processes cannot see cancel_event; they check their run instead
+    parser_processes = _PARSER_PROCESSES
+    run_id = parser_processes.start_run() if parser_processes is not None else None
+
+    def cancel():
+        cancel_event.set()
+        if parser_processes is not None:
+            parser_processes.cancel_run(run_id)
+
+    def record_results(language, results):
+        nonlocal error_handling_type
+        for file_path, result in results.items():
+            if result == TIMEOUT_RESULT:
+                timed_out_files.add(file_path)
+            elif result not in ('None', None):
+                exception_files.add(file_path)
+                languages_used.add(language)
+                error_handling_type = merge_error_handling_types(error_handling_type, result)
+        if error_handling_type == 'Both' and not full_scan:
+            cancel()
+
+    # A bare repository (fetch_mode = objects) is analyzed from its object store without a checkout
+    blob_reader = None
+    read_source = None
+    if is_bare_repository(repo_path):
+        try:
+            tree_blobs = list_tree_blobs(repo_path)
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Cannot list files of {repo_path}: {e.stderr.decode('utf-8', 'replace').strip()}")
+            tree_blobs = {}
+        blob_reader = BlobReader(repo_path)
+        read_source = lambda file_path: blob_reader.read(tree_blobs[file_path])
+    else:
+        tree_blobs = None
+
+    # Group files by language so each external parser is invoked once per repository
+    with stage_timer('discover'):
+        files_by_language, discovery_stats = discover_files(repo_path, tree_blobs, read_source)
+    logging.info(f"Discovery for {repo_path}: {discovery_stats['analyzed']} files to analyze; skipped "
+                 f"{discovery_stats['pruned_directories']} dependency/build directories, "
+                 f"{discovery_stats['generated']} generated files, {discovery_stats['ignored']} ignored by "
+                 f".gitignore/.gitattributes, {discovery_stats['oversized']} over {SETTINGS['max_file_size_kb']} KB")
+
+    # Identical files (vendored libraries, generated clients, forks) are parsed once and their
+    # result is reused across repositories and runs, keyed by git blob SHA
+    file_cache = get_file_cache()
+    if blob_reader is not None:
+        blob_shas = tree_blobs
+    else:
+        blob_shas = get_blob_shas(repo_path) if file_cache else {}
+    file_shas = {}
+    cache_hits = 0
+    pending_by_language = {}
+
+    for language, file_paths in files_by_language.items():
+        if file_cache:
+            language_shas = {file_path: blob_shas.get(os.path.normpath(file_path)) or compute_blob_sha(file_path)
+                             for file_path in file_paths}
+            file_shas.update(language_shas)
+            cached_results = file_cache.get_many(cache_language(language), language_shas.values())
+            hits = {file_path: cached_results[blob_sha]
+                    for file_path, blob_sha in language_shas.items() if blob_sha in cached_results}
+            cache_hits += len(hits)
+            count_metric('files', language, 'cached', len(hits))
+            record_results(language, hits)
+            file_paths = [file_path for file_path in file_paths if file_path not in hits]
+        if file_paths:
+            pending_by_language[language] = file_paths
+
+    # On disk one read per file serves both the keyword prefilter and the parse order. In objects
+    # mode the parser reads the blob again: keeping every blob until its chunk runs would hold the
+    # whole repository in memory.
+    use_prefilter = SETTINGS['keyword_prefilter']
+    prefiltered_files = 0
+    priorities = {}
+    if use_prefilter or not full_scan:
+        for language, file_paths in list(pending_by_language.items()):
+            settled = {}
+            with stage_timer('read', language):
+                for file_path in file_paths:
+                    with open_source(file_path, read_source, head_only=not use_prefilter) as data:
+                        if use_prefilter and not has_candidate_keywords(language, data):
+                            settled[file_path] = 'None'
+                        else:
+                            priorities[file_path] = file_priority(data)
+            count_metric('files', language, 'prefiltered', len(settled))
+            if not settled:
+                continue
+
+            prefiltered_files += len(settled)
+            if file_cache:
+                file_cache.put_many(cache_language(language), {
+                    file_shas[file_path]: result for file_path, result in settled.items() if file_shas.get(file_path)
+                })
+            record_results(language, settled)
+            file_paths = [file_path for file_path in file_paths if file_path not in settled]
+            if file_paths:
+                pending_by_language[language] = file_paths
+            else:
+                del pending_by_language[language]
+
+    if use_prefilter:
+        pending_files = sum(len(file_paths) for file_paths in pending_by_language.values())
+        PREFILTER_STATS['skipped'] += prefiltered_files
+        PREFILTER_STATS['parsed'] += pending_files
+        logging.info(f"Keyword prefilter for {repo_path}: {prefiltered_files} parser invocations avoided, "
+                     f"{pending_files} files left to parse (process total: {PREFILTER_STATS['skipped']} avoided, "
+                     f"{PREFILTER_STATS['parsed']} parsed)")
+
+    if not full_scan:
+        for file_paths in pending_by_language.values():
+            file_paths.sort(key=lambda file_path: -priorities[file_path])
+        pending_by_language = dict(sorted(
+            pending_by_language.items(), key=lambda item: -priorities[item[1][0]]
+        ))
+
+    parsed_files = set()
+    deadline_passed = False
+    chunk_size = max(1, SETTINGS['parser_batch_size'])
+    thread_executor = get_analysis_executors()['threads']
+    # In-process parsing that fits in one chunk stays on its thread instead of paying for the IPC
+    in_process_chunks = sum(
+        (len(file_paths) + chunk_size - 1) // chunk_size
+        for language, file_paths in pending_by_language.items() if in_process_parser(language)
+    )
+    parse_in_process = None
+    if parser_processes is not None and in_process_chunks > 1:
+        parse_in_process = functools.partial(parser_processes.parse, run_id)
+    futures = {
+        thread_executor.submit(
+            parse_files_chunk, language, file_paths[start:start + chunk_size], cancel_event, read_source,
+            parse_in_process
+        ): language
+        for language, file_paths in pending_by_language.items()
+        for start in range(0, len(file_paths), chunk_size)
+    }
+    try:
+        for future in as_completed(futures, timeout=None if deadline is None else max(0, deadline - time.monotonic())):
+            language = futures[future]
+            try:
+                parsed_results = future.result()
+            except Exception as e:
+                logging.error(f"{language} parsing failed in {repo_path}: {e}")
+                count_metric('parser_failures', language, 'exception')
+                continue
+            parsed_files.update(parsed_results)
+            if SETTINGS['metrics_enabled']:
+                count_metric('files', language, 'parsed', len(parsed_results))
+                count_metric('parser_failures', language, 'timeout',
+                             sum(result == TIMEOUT_RESULT for result in parsed_results.values()))
+                count_metric('parser_failures', language, 'unavailable',
+                             sum(result is None for result in parsed_results.values()))
+
+            # Results of parsers that could not run (None, or Swift without sourcekitten) or that
+            # timed out are not cached
+            if file_cache and (language != 'swift' or SOURCEKITTEN_AVAILABLE or parser_engine(language) != 'external'):
+                file_cache.put_many(cache_language(language), {
+                    file_shas[file_path]: result
+                    for file_path, result in parsed_results.items()
+                    if result not in (None, TIMEOUT_RESULT) and file_shas.get(file_path)
+                })
+            record_results(language, parsed_results)
+    except FuturesTimeoutError:
+        deadline_passed = True
+    finally:
+        # Chunks that have not started yet are dropped; running ones, here and in the parser
+        # processes, stop at their next file. They are waited for, so that none of them still holds
+        # a parse slot, reads from a closed BlobReader or parses files cleanup_clone is removing.
+        cancel()
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        if blob_reader is not None:
+            blob_reader.close()
+
+    pending_files = sum(len(file_paths) for file_paths in pending_by_language.values())
+    if deadline_passed:
+        unparsed_files = [file_path for file_paths in pending_by_language.values()
+                          for file_path in file_paths if file_path not in parsed_files]
+        timed_out_files.update(unparsed_files)
+        logging.warning(f"Analysis of {repo_path} passed its {SETTINGS['repo_deadline']:.0f}s deadline; "
+                        f"{len(unparsed_files)} files were not parsed")
+    elif len(parsed_files) < pending_files:
+        logging.info(f"Verdict for {repo_path} settled at 'Both'; skipped {pending_files - len(parsed_files)} files")
+    if timed_out_files:
+        logging.warning(f"{len(timed_out_files)} files of {repo_path} timed out")
+
+    if file_cache:
+        total_files = sum(len(file_paths) for file_paths in files_by_language.values())
+        file_cache.evict()
+        logging.info(f"File result cache for {repo_path}: {cache_hits} hits, {total_files - cache_hits} misses "
+                     f"(process total: {file_cache.hits} hits, {file_cache.misses} misses)")
+
+    return error_handling_type, list(exception_files), list(languages_used), list(timed_out_files)
+
+
+
+def process_repo(row, clone_dir, result_store_path=None):
+    fetched = fetch_repo(row, clone_dir, result_store_path)
+    if fetched is None or 'clone_path' not in fetched:
+        return fetched
+    return analyze_clone(fetched)
+
+
+# Input rows may name one repository with different URLs: http or https, with or without "www.",
+# a trailing slash or ".git", scp-style "git@host:owner/repo", or in another letter case on hosts
+# whose paths ignore case. They all map to the same key, "host/owner/repo".
+CASE_INSENSITIVE_HOSTS = {'github.com', 'gitlab.com', 'bitbucket.org'}
+SCP_URL_PATTERN = re.compile(r'^(?:[\w.-]+@)?([\w.-]+\.[\w-]+):(?!/)(.+)$')
+
+
+def normalize_repo_url(repo_url):
+    url = repo_url.strip()
+    scp_match = SCP_URL_PATTERN.match(url) if '://' not in url else None
+    if scp_match:
+        host, path = scp_match.groups()
+    else:
+        parts = urlsplit(url)
+        if not parts.netloc:
+            # A local path or file:// URL
+            return os.path.normpath(parts.path or url).removesuffix('.git')
+        host = parts.hostname or ''
+        if parts.port and parts.port not in (22, 80, 443):
+            host = f'{host}:{parts.port}'
+        path = parts.path
+    host = host.lower().removeprefix('www.')
+    path = path.strip('/').removesuffix('.git').rstrip('/')
+    if host in CASE_INSENSITIVE_HOSTS:
+        path = path.lower()
+    return f'{host}/{path}'
+
+
+# Network stage of process_repo: answers unchanged repositories from the result store, otherwise
+# clones them. Returns a stored result, a clone for analyze_clone ({'repo_url', 'clone_path',
+# 'head_sha', 'size'}), or None on failure.
+def fetch_repo(row, clone_dir, result_store_path=None, settings=None):
+    settings = settings or SETTINGS
+    try:
         repo_url = row['repo_url']
-        repo_name = repo_url.split('/')[-1].replace('.git', '')
-        clone_path = os.path.join(clone_dir, repo_name)
+        repo_name = normalize_repo_url(repo_url).rsplit('/', 1)[-1] or 'repo'
+
+        # Unchanged repositories are answered from the result store without cloning
+        with stage_timer('remote_head', settings=settings):
+            head_sha = get_remote_head_sha(repo_url)
+        if head_sha and result_store_path:
+            store = ResultStore(result_store_path)
+            try:
+                cached_result = store.get(repo_url, head_sha)
+            finally:
+                store.close()
+            if cached_result:
+                logging.info(f'Repository {repo_url} unchanged at {head_sha}; using stored result')
+                cached_result['cached'] = True
+                return cached_result
 
         logging.info(f'Processing repository {repo_url}...')
-        if clone_repo(repo_url, clone_path, retries=3, delay=5, backoff_factor=2):
+        # Every clone gets a directory of its own, so repositories with the same name but
+        # different owners never share, or remove, each other's working tree
+        clone_path = tempfile.mkdtemp(prefix=f'{repo_name}-', dir=clone_dir)
+        with stage_timer('clone', settings=settings):
+            cloned = clone_repo(repo_url, clone_path, retries=3, delay=5, backoff_factor=2, settings=settings)
+        if cloned:
             if not os.listdir(clone_path):
                 logging.error(f"Clone respository {repo_name} is empty")
+                cleanup_clone(clone_path)
                 return None
-            
-            logging.info(f'Analyzing repository {repo_name}...')
-            error_handling_type, exception_files, languages_used = analyze_code(clone_path)
-            recommendation = get_recommendation(error_handling_type)
-            languages_str = '; '.join(languages_used)
-
-            cleanup_clone(clone_path)
 
             return {
                 'repo_url': repo_url,
-                'Exception Type': error_handling_type,
-                'Recommendation': recommendation,
-                'Languages': languages_str
+                'clone_path': clone_path,
+                'head_sha': head_sha,
+                'size': directory_size(clone_path)
             }
         else:
             logging.error(f"Failed to clone repository: {repo_url}")
+            if os.path.exists(clone_path):
+                cleanup_clone(clone_path)
             return None
     except Exception as e:
         logging.exception(f"Error processing repository {row['repo_url']}: {str(e)}")
         return None
 
 
+# CPU stage of process_repo: analyzes a clone made by fetch_repo and removes it
+def analyze_clone(clone):
+    repo_url = clone['repo_url']
+    clone_path = clone['clone_path']
+    try:
+        logging.info(f'Analyzing repository {os.path.basename(clone_path)}...')
+        with stage_timer('analyze'):
+            error_handling_type, exception_files, languages_used, timed_out_files = analyze_code(clone_path)
+        recommendation = get_recommendation(error_handling_type)
+        languages_str = '; '.join(languages_used)
+
+        result = {
+            'repo_url': repo_url,
+            'Exception Type': error_handling_type,
+            'Recommendation': recommendation,
+            'Languages': languages_str,
+            'Timed Out Files': len(timed_out_files),
+            'head_sha': clone['head_sha']
+        }
+        if SETTINGS['full_scan']:
+            result['Exception Files'] = '; '.join(
+                sorted(os.path.relpath(file_path, clone_path) for file_path in exception_files)
+            )
+        return result
+    except Exception as e:
+        logging.exception(f"Error processing repository {repo_url}: {str(e)}")
+        return None
+    finally:
+        with stage_timer('cleanup'):
+            cleanup_clone(clone_path)
+
+
+# analyze_clone for Pool workers: also hands back the metrics the worker recorded, so that
+# the main process can merge them, and sends the repository's buffered log records
+def analyze_clone_in_worker(clone):
+    try:
+        result = analyze_clone(clone)
+        return result, get_metrics().drain() if SETTINGS['metrics_enabled'] else None
+    finally:
+        flush_log_buffers()
+
+
+def directory_size(path):
+    total_size = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                total_size += os.lstat(os.path.join(root, file)).st_size
+            except OSError:
+                pass
+    return total_size
+
+
 def get_recommendation(error_handling_type):
     if error_handling_type == 'Both':
         return 'The codebase has basic and advanced exception handling.'
@@ -905,44 +3106,323 @@ def cleanup_clone(clone_path):
     except Exception as e:
         logging.error(f"Failed to remove directory {clone_path}: {str(e)}")
 
-def save_cache_incrementally(cache, cache_file, batch_size=1000):
-    temp_cache = {}
-    for i, (key, value) in enumerate(cache.items()):
-        temp_cache[key] = value
-        if (i + 1) % batch_size == 0:
-            try:
-                with open(cache_file, 'ab') as f:
-                    pickle.dump(temp_cache, f)
-                temp_cache.clear()
-            except OSError as e:
-                logging.error(f"Failed to save cache batch: {e}")
+# Persistent analysis results, one row per repository URL and remote HEAD commit. SQLite in WAL
+# mode lets the Pool workers look results up while the main process records new ones.
+class ResultStore:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS repo_results ('
+            'repo_url TEXT NOT NULL, head_sha TEXT NOT NULL, result TEXT NOT NULL, analyzed_at REAL NOT NULL, '
+            'PRIMARY KEY (repo_url, head_sha))'
+        )
+        self.connection.commit()
+
+    # Without a head_sha the most recent result for the repository is returned
+    def get(self, repo_url, head_sha=None):
+        if head_sha is None:
+            row = self.connection.execute(
+                'SELECT result FROM repo_results WHERE repo_url = ? ORDER BY analyzed_at DESC LIMIT 1',
+                (repo_url,)
+            ).fetchone()
+        else:
+            row = self.connection.execute(
+                'SELECT result FROM repo_results WHERE repo_url = ? AND head_sha = ?',
+                (repo_url, head_sha)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, result):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO repo_results (repo_url, head_sha, result, analyzed_at) VALUES (?, ?, ?, ?)',
+            (result['repo_url'], result.get('head_sha') or '', json.dumps(result), time.time())
+        )
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM repo_results').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+
+def open_result_store(cache_file):
+    # Older configurations point at the pickle cache; keep the results next to it in SQLite
+    if cache_file.endswith('.pkl'):
+        cache_file = os.path.splitext(cache_file)[0] + '.sqlite'
+        logging.info(f"Pickle cache files are no longer used; storing results in {cache_file}")
+    return ResultStore(cache_file)
+
+# Per-file parser results keyed by git blob SHA and language, shared by every worker and kept
+# across runs. The store is bounded: least recently used entries beyond max_entries are evicted.
+class FileResultCache:
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS file_results ('
+            'blob_sha TEXT NOT NULL, language TEXT NOT NULL, result TEXT NOT NULL, last_used REAL NOT NULL, '
+            'PRIMARY KEY (blob_sha, language))'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS file_results_last_used ON file_results (last_used)')
+        self.connection.commit()
 
-    if temp_cache:
+    def get_many(self, language, blob_shas):
+        blob_shas = [blob_sha for blob_sha in set(blob_shas) if blob_sha]
+        found = {}
         try:
-            with open(cache_file, 'ab') as f:
-                pickle.dump(temp_cache, f)
-        except OSError as e:
-            logging.error(f"Failed to save final cache batch: {e}")
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(blob_shas), 500):
+                chunk = blob_shas[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                found.update(self.connection.execute(
+                    f'SELECT blob_sha, result FROM file_results WHERE language = ? AND blob_sha IN ({placeholders})',
+                    [language] + chunk
+                ).fetchall())
+            if found:
+                now = time.time()
+                self.connection.executemany(
+                    'UPDATE file_results SET last_used = ? WHERE blob_sha = ? AND language = ?',
+                    [(now, blob_sha, language) for blob_sha in found]
+                )
+                self.connection.commit()
+        except sqlite3.Error as e:
+            logging.error(f"File result cache lookup failed: {e}")
+        self.hits += len(found)
+        self.misses += len(blob_shas) - len(found)
+        return found
+
+    def put_many(self, language, results):
+        if not results:
+            return
+        now = time.time()
+        try:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO file_results (blob_sha, language, result, last_used) VALUES (?, ?, ?, ?)',
+                [(blob_sha, language, result, now) for blob_sha, result in results.items()]
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logging.error(f"File result cache update failed: {e}")
+
+    def evict(self):
+        try:
+            excess = self.connection.execute('SELECT COUNT(*) FROM file_results').fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.connection.execute(
+                    'DELETE FROM file_results WHERE rowid IN '
+                    '(SELECT rowid FROM file_results ORDER BY last_used LIMIT ?)',
+                    (excess,)
+                )
+                self.connection.commit()
+                logging.info(f"Evicted {excess} least recently used entries from the file result cache")
+        except sqlite3.Error as e:
+            logging.error(f"File result cache eviction failed: {e}")
+
+
+_FILE_CACHE = None
+_FILE_CACHE_PID = None
+
+
+def get_file_cache():
+    global _FILE_CACHE, _FILE_CACHE_PID
+    if not SETTINGS['file_cache_path']:
+        return None
+    # SQLite connections must not be shared with forked workers
+    if _FILE_CACHE is None or _FILE_CACHE_PID != os.getpid():
+        try:
+            _FILE_CACHE = FileResultCache(SETTINGS['file_cache_path'], SETTINGS['file_cache_max_entries'])
+            _FILE_CACHE_PID = os.getpid()
+        except sqlite3.Error as e:
+            logging.error(f"Cannot open file result cache {SETTINGS['file_cache_path']}: {e}")
+            return None
+    return _FILE_CACHE
+
+
+# Blob SHAs of the tracked files in a clone, from the index ("git ls-files -s"), keyed by path
+def get_blob_shas(repo_path):
+    try:
+        result = subprocess.run(
+            ['git', '-C', repo_path, 'ls-files', '-s', '-z'],
+            capture_output=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+
+    blob_shas = {}
+    for entry in result.stdout.decode('utf-8', 'surrogateescape').split('\0'):
+        if not entry:
+            continue
+        metadata, _, path = entry.partition('\t')
+        blob_shas[os.path.normpath(os.path.join(repo_path, path))] = metadata.split()[1]
+    return blob_shas
+
+
+# Same hash git uses for blobs, for files that are not tracked in a git index
+def compute_blob_sha(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+STATUS_INTERVAL = 60  # seconds between throughput reports
+
+
+# Two-stage pipeline. A thread pool in this process clones repositories (clone_workers at a time,
+# network-bound); finished clones are handed to one long-lived worker pool that analyzes them
+# (CPU-bound). Clones waiting for or under analysis are bounded by repos_in_flight and by
+# clone_disk_budget_mb of disk, so cloning pauses when analysis falls behind. rows is consumed
+# lazily and each result is yielded as soon as its repository is done. settings (default: SETTINGS)
+# configures both stages: the cloner threads get it through fetch_repo, the workers through worker_init.
+def stream_process_repositories(rows, log_queue, clone_dir, settings=None, result_store_path=None, parse_slots=None):
+    settings = settings or SETTINGS
+    max_in_flight = settings['repos_in_flight']
+    clone_workers = settings['clone_workers']
+    disk_budget = settings['clone_disk_budget_mb'] * 1024 * 1024
+    metrics_interval = settings['metrics_interval']
+    events = queue.Queue()
+    # Rows that name the same repository (see normalize_repo_url) share one clone and analysis:
+    # rows_by_key holds the rows waiting for a repository in flight, results_by_key the results
+    # of finished ones, so that every row gets its own copy of the result. Failures are not kept
+    # in results_by_key: a later row of a repository that failed (a network error, say) clones
+    # it again, as it would have without de-duplication
+    rows_by_key = {}
+    results_by_key = {}
+    duplicate_rows = 0
+
+    def result_for_row(result, row):
+        if result is None or result['repo_url'] == row['repo_url']:
+            return result
+        # A result taken from the store under another URL is new for this row's URL, so main()
+        # stores it under that one as well
+        copied = dict(result, repo_url=row['repo_url'])
+        copied.pop('cached', None)
+        return copied
+
+    def on_analysis_error(key, clone, e):
+        logging.error(f"Worker failed on {clone['repo_url']}: {e}")
+        cleanup_clone(clone['clone_path'])
+        events.put(('analyzed', key, clone, (None, None)))
+
+    def on_analysis_done(key, clone, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            on_analysis_error(key, clone, e)
+        else:
+            events.put(('analyzed', key, clone, result))
 
-def batch_process_repositories(rows, batch_size, log_queue, clone_dir):
-    total_batches = (len(rows) + batch_size - 1) // batch_size
-    
     redirect_logs_to_file()  # Redirect logs to file to avoid distracting progress bar
     suppress_warnings()  # Suppress specific warnings during processing
-    
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i:i + batch_size]
-        logging.info(f"Processing batch {i // batch_size + 1}/{total_batches}...")
-
-        log_system_stats()
 
-        with Pool(processes=os.cpu_count(), initializer=worker_init, initargs=(log_queue,)) as pool:
-            results = list(tqdm(
-                pool.imap_unordered(functools.partial(process_repo, clone_dir=clone_dir), batch),
-                total=len(batch),
-                desc=f"Processing batch {i // batch_size + 1}/{total_batches}"
-            ))
-        yield results
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=worker_init,
+                             initargs=(log_queue, settings, parse_slots)) as pool, \
+            ThreadPoolExecutor(max_workers=clone_workers, thread_name_prefix='cloner') as cloner, \
+            ResourceSampler(clone_dir, max_in_flight, settings) as sampler, \
+            tqdm(desc="Processing repositories", unit="repo") as progress:
+        rows = iter(rows)
+        cloning = 0
+        analyzing = 0
+        bytes_on_disk = 0
+        finished = 0
+        rows_exhausted = False
+        start_time = last_status_time = last_metrics_time = time.monotonic()
+
+        while True:
+            # A clone may always start when nothing is on disk, so one oversized repository, or a
+            # machine that is short of memory or disk anyway, cannot stall the pipeline
+            while (not rows_exhausted and cloning < clone_workers
+                   and (cloning + analyzing == 0 or (cloning + analyzing < sampler.in_flight_limit
+                                                     and bytes_on_disk < disk_budget and not sampler.paused))):
+                row = next(rows, None)
+                if row is None:
+                    rows_exhausted = True
+                    break
+                key = normalize_repo_url(row['repo_url'])
+                if key in rows_by_key:
+                    rows_by_key[key].append(row)
+                    duplicate_rows += 1
+                    continue
+                if key in results_by_key:
+                    duplicate_rows += 1
+                    yield result_for_row(results_by_key[key], row)
+                    continue
+                rows_by_key[key] = [row]
+                future = cloner.submit(fetch_repo, row, clone_dir, result_store_path, settings)
+                future.add_done_callback(
+                    lambda f, key=key: events.put(('fetched', key, None, None if f.exception() else f.result()))
+                )
+                cloning += 1
+
+            if cloning == 0 and analyzing == 0:
+                break
+
+            # Wake up with every sample, so that clones resume as soon as resources free up
+            try:
+                stage, key, clone, result = events.get(timeout=sampler.interval)
+            except queue.Empty:
+                continue
+            if stage == 'fetched':
+                cloning -= 1
+                if result is not None and 'clone_path' in result:
+                    clone = result
+                    bytes_on_disk += clone['size']
+                    analyzing += 1
+                    # A pool broken by a worker that died fails every later submit straight away
+                    try:
+                        future = pool.submit(analyze_clone_in_worker, clone)
+                    except BrokenProcessPool as e:
+                        on_analysis_error(key, clone, e)
+                    else:
+                        future.add_done_callback(
+                            lambda f, key=key, clone=clone: on_analysis_done(key, clone, f)
+                        )
+                    continue
+            else:
+                analyzing -= 1
+                bytes_on_disk -= clone['size']
+                result, worker_metrics = result
+                if worker_metrics:
+                    get_metrics().merge(worker_metrics)
+
+            finished += 1
+            progress.update()
+
+            now = time.monotonic()
+            if now - last_status_time >= STATUS_INTERVAL:
+                last_status_time = now
+                logging.info(f"Throughput: {finished / ((now - start_time) / 60):.1f} repos/min, {finished} done, "
+                             f"{cloning} cloning, {analyzing} queued for analysis "
+                             f"({bytes_on_disk / (1024 ** 2):.0f} MB on disk, limit {sampler.in_flight_limit} in flight); "
+                             f"{sampler.describe()}")
+            if settings['metrics_enabled'] and now - last_metrics_time >= metrics_interval:
+                last_metrics_time = now
+                write_metrics(settings)
+
+            if result is not None:
+                results_by_key[key] = result
+            for row in rows_by_key.pop(key):
+                yield result_for_row(result, row)
+
+        # Workers must exit on their own: one killed while its queue feeder thread holds the write
+        # lock or is half-way through a message would leave the log listener waiting forever
+        pool.shutdown(wait=True)
+
+        write_metrics(settings)
+        elapsed = time.monotonic() - start_time
+        if finished:
+            logging.info(f"Processed {finished} repositories in {elapsed:.0f}s ({finished / (elapsed / 60):.1f} repos/min)")
+        if duplicate_rows:
+            logging.info(f"{duplicate_rows} rows named a repository listed earlier and reused its result")
 
 
 def main():
@@ -950,6 +3430,8 @@ def main():
     sys.excepthook = global_exception_handler
 
     config = load_configuration()
+    settings = load_settings(config)
+    logging.getLogger().setLevel(settings['log_level'])
     input_csv_file_path = config.get('paths', 'input_csv_file_path')
     output_csv_file_path = config.get('paths', 'output_csv_file_path')
     clone_dir = config.get('paths', 'clone_dir')
@@ -958,63 +3440,81 @@ def main():
     if not os.path.exists(clone_dir):
         os.makedirs(clone_dir)
 
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'rb') as f:
-                cache = pickle.load(f)
-        except (EOFError, pickle.UnpicklingError):
-            logging.warning(f"Cache file {cache_file} is corrupted. Starting with an empty cache.")
-            cache = {}
-    else:
-        cache = {}
+    store = open_result_store(cache_file)
+
+    fieldnames = ['repo_url', 'Exception Type', 'Recommendation', 'Languages', 'Timed Out Files']
+    if settings['full_scan']:
+        fieldnames.append('Exception Files')
 
     try:
-        with open(input_csv_file_path, mode='r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            rows = list(reader)
+        input_csv = open(input_csv_file_path, mode='r', newline='', encoding='utf-8')
     except Exception as e:
         logging.error(f"Failed to read input CSV file: {e}")
         listener.stop()
         sys.exit(1)
 
-    total_repos = len(rows)
-    logging.info(f"Total repositories in input CSV: {total_repos}")
-
-    batch_size = 50 #batch size is set to 50 per a batch.
-
     try:
-        with open(output_csv_file_path, mode='w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['repo_url', 'Exception Type', 'Recommendation', 'Languages']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+        output_csv = open(output_csv_file_path, mode='w', newline='', encoding='utf-8')
+        writer = csv.DictWriter(output_csv, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
     except Exception as e:
         logging.error(f"Failed to write to output CSV file: {e}")
+        input_csv.close()
         listener.stop()
         sys.exit(1)
 
-    for batch_results in batch_process_repositories(rows, batch_size, log_queue, clone_dir):
-        successful_ops = sum(1 for result in batch_results if result is not None)
-        failed_ops = len(batch_results) - successful_ops
-
-        logging.info(f"Successful operations in batch: {successful_ops}")
-        logging.info(f"Failed operations in batch: {failed_ops}")
-
-        for result in batch_results:
-            if result:
-                cache[result['repo_url']] = result
-
-        save_cache_incrementally(cache, cache_file)
+    counts = {'rows': 0, 'reused': 0, 'successful': 0, 'failed': 0, 'cached': 0}
 
+    def write_result(result):
         try:
-            with open(output_csv_file_path, mode='a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writerows(result for result in batch_results if result)
+            writer.writerow(result)
+            output_csv.flush()
         except Exception as e:
             logging.error(f"Error writing to the CSV file: {e}")
 
-    logging.info(f"Total repositories processed: {total_repos}")
-    logging.info(f"Repositories in output CSV: {len(cache)}")
+    # Without remote HEAD checks any stored result is reused as-is, so a re-run after a crash
+    # only schedules the repositories that were never analyzed
+    def pending_rows():
+        for row in csv.DictReader(input_csv):
+            counts['rows'] += 1
+            if not settings['check_remote_head']:
+                stored_result = store.get(row['repo_url'])
+                if stored_result:
+                    counts['reused'] += 1
+                    write_result(stored_result)
+                    continue
+            yield row
+
+    # One budget of parser slots shared by all workers and their analysis threads
+    parse_slots = multiprocessing.BoundedSemaphore(settings['max_parallel_parsers'])
+
+    try:
+        for result in stream_process_repositories(pending_rows(), log_queue, clone_dir, settings, store.path, parse_slots):
+            if result is None:
+                counts['failed'] += 1
+                continue
+
+            counts['successful'] += 1
+            if result.get('cached'):
+                counts['cached'] += 1
+            else:
+                try:
+                    store.put(result)
+                except sqlite3.Error as e:
+                    logging.error(f"Failed to store result for {result['repo_url']}: {e}")
+            write_result(result)
+    finally:
+        input_csv.close()
+        output_csv.close()
+
+    logging.info(f"Total repositories in input CSV: {counts['rows']}")
+    logging.info(f"Reused without analysis: {counts['reused']}")
+    logging.info(f"Successful operations: {counts['successful']} ({counts['cached']} from the result store)")
+    logging.info(f"Failed operations: {counts['failed']}")
+    logging.info(f"Repositories in output CSV: {counts['reused'] + counts['successful']}")
+    logging.info(f"Results in store: {len(store)}")
 
+    store.close()
     listener.stop()
 
 if __name__ == '__main__':
@@ -0,0 +1,150 @@
+"""Single-pass Java preprocessor against the 25-regex chain it replaced.
+
+Every Java file under the given repositories is preprocessed by both versions. The report gives
+the total and worst-case time of each and how many outputs are identical. The old chain also
+rewrote every quote to "@@QUOTE@@" and dropped operators such as "!" and "&&", so its output is
+rarely valid Java and identical output is not expected; "--parse" measures what matters instead:
+how many files JavaParser rejects that each version makes parseable, and whether the new
+preprocessor changes the verdict of any file JavaParser already accepts (exit status 1 if so).
+The repositories listed in EXPERIMENT/Java are the intended input once cloned.
+
+Run from the project root (the Java parser is resolved relative to it):
+
+    python benchmarks/java_preprocess_benchmark.py cloned_repos/some_repo [more repos...] [--parse]
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebServFH
+
+
+# preprocess_java_code as it was before the single-pass rewrite, kept for comparison
+def legacy_preprocess_java_code(code):
+    # Remove BOM and normalize Unicode
+    code = code.replace('\ufeff', '')
+    code = unicodedata.normalize('NFKC', code)
+    code = code.encode('utf-16', 'surrogatepass').decode('utf-16')
+
+    # Additional preprocessing to handle problematic annotations
+    code = re.sub(r'@(\w+)\s*(\([^)]*\))?\s*(?=class|interface|enum|@interface)', r'/* @\1\2 */', code)
+    
+    # Normalize line endings
+    code = code.replace('\r\n', '\n').replace('\r', '\n')
+    code = code.replace('\u2028', '\n').replace('\u2029', '\n')
+
+    # Remove invalid control characters
+    code = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', code)
+
+    # Standardize quote characters
+    code = code.replace('’', "'").replace('“', '"').replace('”', '"')
+    
+    code = re.sub(r'("(?:[^"\\]|\\.)*$)', r'\1"', code)  # Close unclosed double quotes
+    code = re.sub(r"('(?:[^'\\]|\\.)*$)", r"\1'", code)  # Close unclosed single quotes
+
+    # Handle hash selectively (e.g., color codes)
+    code = re.sub(r'#([0-9A-Fa-f]{6}|[0-9A-Fa-f]{3})(?!\w)', r'COLOR_\1', code)
+
+    # Escape special characters and balance quotes
+    code = re.sub(r'\\u([0-9A-Fa-f]{4})', lambda m: '\\u' + m.group(1).upper(), code)  # Normalize Unicode escapes to uppercase
+    code = re.sub(r'"(.*?)"', lambda m: '"' + m.group(1).replace('#', '\\#').replace('\n', '\\n') + '"', code)
+    code = re.sub(r'(\\*)"', lambda m: '@@QUOTE@@' if len(m.group(1)) % 2 == 0 else m.group(0), code)
+    code = re.sub(r"(\\*)'", lambda m: "@@SINGLE_QUOTE@@" if len(m.group(1)) % 2 == 0 else m.group(0), code)
+    code = re.sub(r'(\\+)', r'\\\\', code)
+
+    # Handle emojis and symbols
+    code = re.sub(r'[^\x00-\x7F]', lambda x: f'\\u{ord(x.group(0)):04x}', code)
+
+    # Normalize block comments
+    code = re.sub(r'/\*.*?\*/', '/* */', code, flags=re.DOTALL)
+    code = re.sub(r'/\*.*$', '/* */', code, flags=re.DOTALL)
+
+    # Remove line comments
+    code = re.sub(r'//.*$', '', code, flags=re.MULTILINE)
+    code = re.sub(r'/\*.*?\*/', '', code, flags=re.DOTALL)
+
+    # Handle unescaped line breaks in strings
+    def replace_newlines(match):
+        return match.group(1) + match.group(2) + match.group(3).replace('\n', '\\n') + match.group(4) + match.group(2)
+
+    code = re.sub(r'([^\\])(["\'`])(.*?)\n(.*?)\2', replace_newlines, code, flags=re.DOTALL)
+    
+
+    # Remove unwanted symbols (e.g., "So" category in Unicode)
+    code = re.sub(r'[^\w\s#@,"\'(){}[\]<>;.:*/+=-]', '', code)
+
+    # Ensure the code ends with a newline
+    if not code.endswith('\n'):
+        code += '\n'
+
+    return code
+
+
+
+def timed(preprocess, code):
+    start = time.perf_counter()
+    output = preprocess(code)
+    return output, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('repos', nargs='+', help='local repository directories')
+    parser.add_argument('--parse', action='store_true', help='also run JavaParser over the raw and preprocessed code')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    report = {
+        'files': 0, 'identical_output': 0,
+        'legacy': {'seconds': 0.0, 'slowest_file_seconds': 0.0},
+        'single_pass': {'seconds': 0.0, 'slowest_file_seconds': 0.0}
+    }
+    if args.parse:
+        report.update({'rejected': 0, 'recovered_by_legacy': 0, 'recovered_by_single_pass': 0, 'verdict_changes': []})
+
+    for repo_path in args.repos:
+        for file_path in WebServFH.discover_files(repo_path)[0].get('java', []):
+            code = WebServFH.read_text_file(file_path)
+            report['files'] += 1
+
+            outputs = {}
+            for name, preprocess in (('legacy', legacy_preprocess_java_code),
+                                     ('single_pass', WebServFH.preprocess_java_code)):
+                outputs[name], seconds = timed(preprocess, code)
+                report[name]['seconds'] += seconds
+                report[name]['slowest_file_seconds'] = max(report[name]['slowest_file_seconds'], seconds)
+            report['identical_output'] += outputs['legacy'] == outputs['single_pass']
+
+            if not args.parse:
+                continue
+            verdict = WebServFH.run_java_parser(code)
+            if verdict is None:
+                report['rejected'] += 1
+                for name in outputs:
+                    report[f'recovered_by_{name}'] += WebServFH.run_java_parser(outputs[name]) is not None
+                continue
+            preprocessed_verdict = WebServFH.run_java_parser(outputs['single_pass'])
+            if preprocessed_verdict != verdict:
+                report['verdict_changes'].append({
+                    'path': file_path, 'raw': verdict, 'single_pass': preprocessed_verdict
+                })
+
+    for name in ('legacy', 'single_pass'):
+        for key in report[name]:
+            report[name][key] = round(report[name][key], 4)
+
+    print(json.dumps(report, indent=2))
+    WebServFH.shutdown_parser_daemons()
+    sys.exit(1 if report.get('verdict_changes') else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Agreement between the external parsers and the tree-sitter engine.
+
+Every analyzable file of the selected languages under the given directories is classified by
+both engines. The report gives per-language agreement and lists every file where the verdicts
+differ; the exit status is 1 when any file differs, so a run can gate switching a language's
+engine in config.ini. Files the external parser could not process at all are counted apart.
+The report's "git_rules" entry checks that discovery applies anchored and unanchored
+.gitignore rules the way git does; a mismatch there also exits with status 1.
+
+Run from the project root (the external parsers are resolved relative to it):
+
+    python benchmarks/parser_parity.py cloned_repos/some_repo [more dirs...] [--languages java go]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebServFH
+
+
+def compare(language, file_paths):
+    WebServFH.SETTINGS['parser_engines'][language] = 'external'
+    external_results = WebServFH.parse_files(language, file_paths)
+
+    report = {'files': len(file_paths), 'agree': 0, 'external_failed': 0, 'differences': []}
+    for file_path in file_paths:
+        external_result = external_results.get(file_path)
+        if external_result is None:
+            report['external_failed'] += 1
+            continue
+        tree_sitter_result = WebServFH.parse_file_with_tree_sitter(language, file_path)
+        if tree_sitter_result == external_result:
+            report['agree'] += 1
+        else:
+            report['differences'].append({
+                'path': file_path, 'external': external_result, 'tree-sitter': tree_sitter_result
+            })
+    return report
+
+
+# (.gitignore line, relative path, whether git ignores the path)
+GIT_RULE_CASES = [
+    ('/lib/', 'lib/a.py', True),
+    ('/lib/', 'sub/lib/d.py', False),
+    ('lib/', 'lib/a.py', True),
+    ('lib/', 'sub/lib/d.py', True),
+    ('lib/', 'lib.py', False),
+    ('docs/api/', 'docs/api/x.py', True),
+    ('docs/api/', 'sub/docs/api/x.py', False),
+    ('/generated', 'generated/x.py', True),
+    ('/generated', 'sub/generated/x.py', False),
+    ('generated', 'sub/generated/x.py', True),
+    ('**/build/', 'a/b/build/x.py', True),
+]
+
+
+def check_git_rules():
+    report = {'cases': len(GIT_RULE_CASES), 'differences': []}
+    for line, relative_path, ignored in GIT_RULE_CASES:
+        rules = WebServFH.load_git_rules(lambda name: line if name == '.gitignore' else None)
+        if WebServFH.is_excluded_by_rules(relative_path, rules) != ignored:
+            report['differences'].append({'rule': line, 'path': relative_path, 'expected_ignored': ignored})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='directories with source files')
+    parser.add_argument('--languages', nargs='+', default=list(WebServFH.ENGINE_LANGUAGES),
+                        choices=WebServFH.ENGINE_LANGUAGES, help='languages to compare (default: all)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    files_by_language = {}
+    for path in args.paths:
+        for language, file_paths in WebServFH.discover_files(path)[0].items():
+            files_by_language.setdefault(language, []).extend(file_paths)
+
+    reports = {'git_rules': check_git_rules()}
+    for language in args.languages:
+        if not files_by_language.get(language):
+            continue
+        if not WebServFH.tree_sitter_available(language):
+            logging.warning(f"Skipping {language}: tree-sitter grammar not installed")
+            continue
+        reports[language] = compare(language, files_by_language[language])
+
+    print(json.dumps(reports, indent=2))
+    sys.exit(1 if any(report['differences'] for report in reports.values()) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""End-to-end throughput of the repository pipeline on synthetic local repositories.
+
+Creates git repositories on local disk with a chosen number of files per repository, lines per
+file, languages and mix of None/Basic/Advanced/Both files, and serves them through file:// URLs.
+The repositories then go through the same pipeline main() runs (stream_process_repositories:
+clone, discover, prefilter, parse, clean up) with the chosen fetch mode. A second pass times
+each language's parser one file at a time for latency percentiles.
+
+The report is one JSON object: repos/min, files/sec, peak RSS of this process and all its
+children, per-language parser latency percentiles, and the repositories whose verdict differs
+from the one their files were generated with. Compare reports of two versions to catch
+regressions; the exit status is 1 when any verdict differs.
+
+Run from the project root (the external parsers are resolved relative to it):
+
+    python benchmarks/pipeline_benchmark.py --repos 20 --files 50 --languages python java go [--output report.json]
+"""
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from configparser import ConfigParser
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebServFH
+
+CATEGORIES = ('None', 'Basic', 'Advanced', 'Both')
+
+# Per language: file extension, text around the members, one member per category and one
+# filler line ({n} is the line number) that pads files to the requested size
+TEMPLATES = {
+    'python': {
+        'ext': '.py', 'header': '', 'footer': '',
+        'basic': 'def fetch(client):\n    try:\n        return client.get()\n    except Exception:\n        return None\n',
+        'advanced': 'def fetch_again(client):\n    return retry(client.get)\n',
+        'none': 'def fetch_plain(client):\n    return client.get()\n',
+        'filler': 'value_{n} = {n} * 2\n'
+    },
+    'java': {
+        'ext': '.java', 'header': 'public class Service {\n', 'footer': '}\n',
+        'basic': '    Object fetch(Client client) {\n        try {\n            return client.get();\n'
+                 '        } catch (Exception e) {\n            return null;\n        }\n    }\n',
+        'advanced': '    Object fetchAgain(Client client) {\n        return client.retry();\n    }\n',
+        'none': '    Object fetchPlain(Client client) {\n        return client.get();\n    }\n',
+        'filler': '    int value{n} = {n} * 2;\n'
+    },
+    'javascript': {
+        'ext': '.js', 'header': '', 'footer': '',
+        'basic': 'function fetch(client) {\n  try {\n    return client.get();\n  } catch (e) {\n    return null;\n  }\n}\n',
+        'advanced': 'function fetchAgain(client) {\n  return retry(() => client.get());\n}\n',
+        'none': 'function fetchPlain(client) {\n  return client.get();\n}\n',
+        'filler': 'const value{n} = {n} * 2;\n'
+    },
+    'typescript': {
+        'ext': '.ts', 'header': '', 'footer': '',
+        'basic': 'function fetch(client: any) {\n  try {\n    return client.get();\n  } catch (e) {\n    return null;\n  }\n}\n',
+        'advanced': 'function fetchAgain(client: any) {\n  return retry(() => client.get());\n}\n',
+        'none': 'function fetchPlain(client: any) {\n  return client.get();\n}\n',
+        'filler': 'const value{n}: number = {n} * 2;\n'
+    },
+    'go': {
+        'ext': '.go', 'header': 'package main\n\n', 'footer': '',
+        'basic': 'func fetch(client Client) error {\n\terr := client.Get()\n\tif err != nil {\n\t\treturn err\n\t}\n\treturn nil\n}\n',
+        'advanced': 'func fetchAgain(client Client) {\n\tclient.Retry()\n}\n',
+        'none': 'func fetchPlain(client Client) {\n\tclient.Get()\n}\n',
+        'filler': 'var value{n} = {n} * 2\n'
+    },
+    'ruby': {
+        'ext': '.rb', 'header': '', 'footer': '',
+        'basic': 'def fetch(client)\n  client.get\nrescue StandardError\n  nil\nend\n',
+        'advanced': 'def fetch_again(client)\n  timeout(5) { client.get }\nend\n',
+        'none': 'def fetch_plain(client)\n  client.get\nend\n',
+        'filler': 'VALUE_{n} = {n} * 2\n'
+    },
+    'csharp': {
+        'ext': '.cs', 'header': 'class Service {\n', 'footer': '}\n',
+        'basic': '    object Fetch(Client client) {\n        try { return client.Get(); } catch (Exception) { return null; }\n    }\n',
+        'advanced': '    object FetchAgain(Client client) {\n        return client.retry();\n    }\n',
+        'none': '    object FetchPlain(Client client) {\n        return client.Get();\n    }\n',
+        'filler': '    int value{n} = {n} * 2;\n'
+    },
+    'kotlin': {
+        'ext': '.kt', 'header': '', 'footer': '',
+        'basic': 'fun fetch(client: Client): Any? {\n    try {\n        return client.get()\n'
+                 '    } catch (e: Exception) {\n        return null\n    }\n}\n',
+        'advanced': 'fun fetchAgain(client: Client) = client.retry()\n',
+        'none': 'fun fetchPlain(client: Client) = client.get()\n',
+        'filler': 'val value{n} = {n} * 2\n'
+    },
+    'swift': {
+        'ext': '.swift', 'header': '', 'footer': '',
+        'basic': 'func fetch(client: Client) {\n    do {\n        try client.get()\n    } catch {\n    }\n}\n',
+        'advanced': 'func fetchAgain(client: Client) {\n    retry()\n}\n',
+        'none': 'func fetchPlain(client: Client) {\n    client.get()\n}\n',
+        'filler': 'let value{n} = {n} * 2\n'
+    }
+}
+
+
+def source_text(language, category, lines):
+    template = TEMPLATES[language]
+    members = {
+        'None': [template['none']],
+        'Basic': [template['basic']],
+        'Advanced': [template['advanced']],
+        'Both': [template['basic'], template['advanced']]
+    }[category]
+    filler = ''.join(template['filler'].format(n=n) for n in range(lines))
+    return template['header'] + ''.join(members) + filler + template['footer']
+
+
+def git(*args, cwd):
+    subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True)
+
+
+# Returns [(repo_url, expected verdict, {file_path: (language, category)})]
+def create_repositories(root, args):
+    rng = random.Random(args.seed)
+    weights = [args.mix[category] for category in CATEGORIES]
+    repositories = []
+    for index in range(args.repos):
+        repo_path = os.path.join(root, f'bench_repo_{index:04d}')
+        os.makedirs(repo_path)
+        files = {}
+        verdict = 'None'
+        for number in range(args.files):
+            language = args.languages[number % len(args.languages)]
+            category = rng.choices(CATEGORIES, weights)[0]
+            relative_path = os.path.join('src', language, f'file_{number:05d}{TEMPLATES[language]["ext"]}')
+            os.makedirs(os.path.join(repo_path, os.path.dirname(relative_path)), exist_ok=True)
+            with open(os.path.join(repo_path, relative_path), 'w', encoding='utf-8') as f:
+                f.write(source_text(language, category, args.lines))
+            files[relative_path] = (language, category)
+            verdict = WebServFH.merge_error_handling_types(verdict, category)
+
+        git('init', '-q', cwd=repo_path)
+        # Partial clones of a file:// remote need these on the serving side
+        git('config', 'uploadpack.allowFilter', 'true', cwd=repo_path)
+        git('config', 'uploadpack.allowAnySHA1InWant', 'true', cwd=repo_path)
+        git('add', '-A', cwd=repo_path)
+        git('-c', 'user.name=bench', '-c', 'user.email=bench@localhost', 'commit', '-q', '-m', 'synthetic', cwd=repo_path)
+        repositories.append((f'file://{repo_path}', verdict, files))
+    return repositories
+
+
+# Samples the summed RSS of this process and all of its descendants
+class PeakRssSampler(threading.Thread):
+    def __init__(self, interval=0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+
+    def run(self):
+        process = psutil.Process()
+        while not self.stop_event.is_set():
+            total = 0
+            for member in [process] + process.children(recursive=True):
+                try:
+                    total += member.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak = max(self.peak, total)
+            self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+def run_pipeline(repositories, work_dir, settings):
+    clone_dir = os.path.join(work_dir, 'clones')
+    os.makedirs(clone_dir)
+    log_queue = multiprocessing.Queue()
+    listener = WebServFH.BatchQueueListener(log_queue, logging.FileHandler(os.path.join(work_dir, 'pipeline.log')))
+    listener.start()
+    parse_slots = multiprocessing.BoundedSemaphore(settings['max_parallel_parsers'])
+
+    results = {}
+    rows = ({'repo_url': repo_url} for repo_url, _, _ in repositories)
+    start = time.perf_counter()
+    try:
+        for result in WebServFH.stream_process_repositories(rows, log_queue, clone_dir, settings, None, parse_slots):
+            if result is not None:
+                results[result['repo_url']] = result
+    finally:
+        listener.stop()
+    return results, time.perf_counter() - start
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+
+    def rank(fraction):
+        return round(samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 2)
+
+    return {'count': len(samples), 'p50_ms': rank(0.5), 'p90_ms': rank(0.9), 'p99_ms': rank(0.99),
+            'max_ms': round(samples[-1] * 1000, 2)}
+
+
+def parser_latencies(repositories, work_dir, samples_per_language):
+    samples = {}
+    for repo_url, _, files in repositories:
+        repo_path = repo_url[len('file://'):]
+        for relative_path, (language, _) in files.items():
+            language_samples = samples.setdefault(language, [])
+            if len(language_samples) >= samples_per_language:
+                continue
+            start = time.perf_counter()
+            WebServFH.parse_files(language, [os.path.join(repo_path, relative_path)])
+            language_samples.append(time.perf_counter() - start)
+    return {language: percentiles(language_samples) for language, language_samples in samples.items()}
+
+
+def parse_mix(text):
+    mix = dict.fromkeys(CATEGORIES, 0)
+    for part in text.split(','):
+        category, _, weight = part.partition('=')
+        if category.strip() not in mix:
+            raise argparse.ArgumentTypeError(f"unknown category {category.strip()!r}")
+        mix[category.strip()] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repos', type=int, default=20, help='synthetic repositories (default: 20)')
+    parser.add_argument('--files', type=int, default=50, help='files per repository (default: 50)')
+    parser.add_argument('--lines', type=int, default=200, help='filler lines per file (default: 200)')
+    parser.add_argument('--languages', nargs='+', default=['python'], choices=sorted(TEMPLATES),
+                        help='languages the files cycle through (default: python)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('None=40,Basic=30,Advanced=20,Both=10'),
+                        help='relative weight of each file category (default: None=40,Basic=30,Advanced=20,Both=10)')
+    parser.add_argument('--fetch-mode', default='full', choices=WebServFH.FETCH_MODES)
+    parser.add_argument('--full-scan', action='store_true', help='parse every file instead of stopping at "Both"')
+    parser.add_argument('--latency-samples', type=int, default=200, help='files timed per language (default: 200)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--work-dir', help='where repositories and clones are created (default: a temp dir)')
+    parser.add_argument('--keep', action='store_true', help='keep the work dir afterwards')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='webservfh_bench_')
+    os.makedirs(work_dir, exist_ok=True)
+
+    # Defaults of a fresh config.ini, without caches, so every repository is cloned and parsed
+    # The overrides go into WebServFH.SETTINGS as well, so every stage (cloning, analysis and
+    # the latency pass in this process) runs with the configuration the report names
+    WebServFH.load_settings(ConfigParser())
+    WebServFH.SETTINGS.update(fetch_mode=args.fetch_mode, full_scan=args.full_scan, file_cache_path='')
+    settings = dict(WebServFH.SETTINGS)
+
+    try:
+        repositories = create_repositories(os.path.join(work_dir, 'remotes'), args)
+
+        sampler = PeakRssSampler()
+        sampler.start()
+        try:
+            results, seconds = run_pipeline(repositories, work_dir, settings)
+        finally:
+            sampler.stop()
+
+        mismatches = []
+        for repo_url, expected, _ in repositories:
+            result = results.get(repo_url)
+            actual = result['Exception Type'] if result else None
+            if actual != expected:
+                mismatches.append({'repo_url': repo_url, 'expected': expected, 'actual': actual})
+
+        total_files = args.repos * args.files
+        report = {
+            'version': subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip(),
+            'parameters': {
+                'repos': args.repos, 'files_per_repo': args.files, 'lines_per_file': args.lines,
+                'languages': args.languages, 'mix': args.mix, 'fetch_mode': args.fetch_mode,
+                'full_scan': args.full_scan, 'seed': args.seed, 'cpus': os.cpu_count()
+            },
+            'seconds': round(seconds, 3),
+            'repos_per_min': round(args.repos / (seconds / 60), 1),
+            'files_per_sec': round(total_files / seconds, 1),
+            'failed_repos': args.repos - len(results),
+            'peak_rss_mb': round(sampler.peak / (1024 * 1024), 1),
+            'parser_latency': parser_latencies(repositories, work_dir, args.latency_samples),
+            'verdict_mismatches': mismatches
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Iterative Python analyzer against the recursive visitor it replaced.
+
+Every Python file under the given directories is classified by both versions, which are timed
+separately. The report gives files per second for each and lists every file where the verdicts
+differ; the exit status is 1 when any file differs. EXPERIMENT/Python holds metrics only, so
+point the script at cloned repositories (or any tree with thousands of Python files).
+
+Run from the project root:
+
+    python benchmarks/python_analyzer_benchmark.py cloned_repos/some_repo [more dirs...] [--repeat 3]
+"""
+import argparse
+import ast
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebServFH
+
+# The recursive visitor relied on the raised limit the module used to set
+sys.setrecursionlimit(1500)
+
+
+# parse_python_code as it was before the iterative rewrite, kept for comparison
+def legacy_parse_python_code(code):
+    error_handling_type = 'None'
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        logging.error(f"SyntaxError: Invalid Python code. Detail: {str(e)}")
+        return error_handling_type  # Return early if the code cannot be parsed
+
+    class ErrorHandlingVisitor(ast.NodeVisitor):
+        def __init__(self):
+            self.has_basic_handling = False
+            self.has_advanced_handling = False
+
+        def visit_Try(self, node):
+            self.has_basic_handling = True
+            if self.has_advanced_handling:
+                return  # Stop traversal if both types are found
+            self.generic_visit(node)
+
+        def visit_ExceptHandler(self, node):
+            self.has_basic_handling = True
+            if self.has_advanced_handling:
+                return  # Stop traversal if both types are found
+            self.generic_visit(node)
+
+        def visit_Call(self, node):
+            if isinstance(node.func, ast.Name) and node.func.id.lower() in {"timeout", "retry", "circuitbreaker", "backoff"}:
+                self.has_advanced_handling = True
+            elif isinstance(node.func, ast.Attribute):
+                if node.func.attr.lower() in {'status_code', 'raise_for_status'}:
+                    self.has_basic_handling = True
+            
+            if self.has_basic_handling and self.has_advanced_handling:
+                return  # Stop traversal if both types are found
+            self.generic_visit(node)
+
+        def visit_With(self, node):
+            for item in node.items:
+                if isinstance(item.context_expr, ast.Call):
+                    if isinstance(item.context_expr.func, ast.Name) and item.context_expr.func.id.lower() in {"timeout", "retry", "circuitbreaker", "backoff"}:
+                        self.has_advanced_handling = True
+                        if self.has_basic_handling:
+                            return  # Stop traversal if both types are found
+            self.generic_visit(node)
+
+    visitor = ErrorHandlingVisitor()
+    visitor.visit(tree)
+
+    if visitor.has_basic_handling and visitor.has_advanced_handling:
+        error_handling_type = 'Both'
+    elif visitor.has_advanced_handling:
+        error_handling_type = 'Advanced'
+    elif visitor.has_basic_handling:
+        error_handling_type = 'Basic'
+
+    return error_handling_type
+
+
+def timed(parse, sources, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [parse(source) for source in sources]
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return results, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='directories with Python files')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs per version; the fastest is reported')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    file_paths = []
+    for path in args.paths:
+        file_paths.extend(WebServFH.discover_files(path)[0].get('python', []))
+    sources = [WebServFH.read_text_file(file_path) for file_path in file_paths]
+
+    legacy_results, legacy_seconds = timed(legacy_parse_python_code, sources, args.repeat)
+    results, seconds = timed(WebServFH.parse_python_code, sources, args.repeat)
+
+    differences = [
+        {'path': file_path, 'legacy': legacy_result, 'iterative': result}
+        for file_path, legacy_result, result in zip(file_paths, legacy_results, results)
+        if legacy_result != result
+    ]
+    report = {
+        'files': len(sources),
+        'legacy': {'seconds': round(legacy_seconds, 3), 'files_per_second': round(len(sources) / max(legacy_seconds, 1e-9), 1)},
+        'iterative': {'seconds': round(seconds, 3), 'files_per_second': round(len(sources) / max(seconds, 1e-9), 1)},
+        'differences': differences
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if differences else 0)
+
+
+if __name__ == '__main__':
+    main()
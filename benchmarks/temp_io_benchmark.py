@@ -0,0 +1,62 @@
+"""Bytes written to the temp dir per repository, before and after in-place parsing.
+
+"before" replays the old analyze_code flow: every file is read and decoded by parse_file and handed
+to its parse_*_code function, which copies it into a temp file for the parser process.
+"after" is the current analyze_code, which lets the parsers read the files in place.
+
+Run from the project root (the parsers are resolved relative to it):
+
+    python benchmarks/temp_io_benchmark.py cloned_repos/some_repo [more repos...]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebServFH
+
+
+def analyze_with_code_strings(repo_path):
+    for root, _, files in os.walk(repo_path):
+        for file in files:
+            language = WebServFH.EXTENSION_TO_LANGUAGE.get(os.path.splitext(file)[1])
+            if language in WebServFH.CODE_PARSERS:
+                WebServFH.parse_file(WebServFH.CODE_PARSERS[language], os.path.join(root, file))
+
+
+def measure(analyze, repo_path, use_daemons):
+    WebServFH.SETTINGS['use_parser_daemons'] = use_daemons
+    files_before = WebServFH.TEMP_IO_STATS['files']
+    bytes_before = WebServFH.TEMP_IO_STATS['bytes']
+    start = time.perf_counter()
+    analyze(repo_path)
+    return {
+        'temp_files_written': WebServFH.TEMP_IO_STATS['files'] - files_before,
+        'temp_bytes_written': WebServFH.TEMP_IO_STATS['bytes'] - bytes_before,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('repos', nargs='+', help='local repository directories')
+    parser.add_argument('--daemons', action='store_true', help='use parser daemons for the "after" run')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    for repo_path in args.repos:
+        report = {
+            'repo': repo_path,
+            'before': measure(analyze_with_code_strings, repo_path, use_daemons=False),
+            'after': measure(WebServFH.analyze_code, repo_path, use_daemons=args.daemons)
+        }
+        print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
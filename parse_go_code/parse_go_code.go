@@ -1,6 +1,8 @@
 package main
 
 import (
+    "bufio"
+    "encoding/json"
     "fmt"
     "go/ast"
     "go/parser"
@@ -9,22 +11,139 @@ import (
     "strings"
 )
 
+type fileResult struct {
+    Path                string `json:"path,omitempty"`
+    HasBasicHandling    bool   `json:"hasBasicHandling"`
+    HasAdvancedHandling bool   `json:"hasAdvancedHandling"`
+    Error               string `json:"error,omitempty"`
+}
+
+type serverRequest struct {
+    Path *string `json:"path"`
+    Code *string `json:"code"`
+}
+
 func main() {
     if len(os.Args) < 2 {
         fmt.Println("false,false")
         return
     }
 
-    filePath := os.Args[1]
-    fset := token.NewFileSet()
+    if os.Args[1] == "--server" {
+        runServer()
+        return
+    }
 
-    node, err := parser.ParseFile(fset, filePath, nil, parser.AllErrors)
+    if os.Args[1] == "--batch" || os.Args[1] == "--manifest" {
+        runBatch(os.Args[1:])
+        return
+    }
+
+    hasBasicHandling, hasAdvancedHandling, err := analyzeFile(os.Args[1])
     if err != nil {
         fmt.Println("false,false")
         fmt.Fprintln(os.Stderr, "Error parsing file:", err)
         return
     }
 
+    fmt.Printf("%t,%t\n", hasBasicHandling, hasAdvancedHandling)
+}
+
+// Batch mode: "--batch <path>..." or "--manifest <file with one path per line>".
+// Prints a JSON array with one result object per input path.
+func runBatch(args []string) {
+    var paths []string
+    if args[0] == "--manifest" {
+        manifest, err := os.Open(args[1])
+        if err != nil {
+            fmt.Fprintln(os.Stderr, "Error reading manifest:", err)
+            os.Exit(1)
+        }
+        scanner := bufio.NewScanner(manifest)
+        for scanner.Scan() {
+            if line := strings.TrimSpace(scanner.Text()); line != "" {
+                paths = append(paths, line)
+            }
+        }
+        manifest.Close()
+    } else {
+        paths = args[1:]
+    }
+
+    results := make([]fileResult, 0, len(paths))
+    for _, path := range paths {
+        result := fileResult{Path: path}
+        hasBasicHandling, hasAdvancedHandling, err := analyzeFile(path)
+        if err != nil {
+            result.Error = err.Error()
+        } else {
+            result.HasBasicHandling = hasBasicHandling
+            result.HasAdvancedHandling = hasAdvancedHandling
+        }
+        results = append(results, result)
+    }
+
+    output, _ := json.Marshal(results)
+    fmt.Println(string(output))
+}
+
+// Worker-server mode: one JSON request per stdin line ({"path": ...} or {"code": ...}),
+// one JSON result per stdout line. Exits when stdin is closed.
+func runServer() {
+    reader := bufio.NewReader(os.Stdin)
+    writer := bufio.NewWriter(os.Stdout)
+    for {
+        line, readErr := reader.ReadBytes('\n')
+        if len(strings.TrimSpace(string(line))) > 0 {
+            output, _ := json.Marshal(handleRequest(line))
+            writer.Write(output)
+            writer.WriteByte('\n')
+            writer.Flush()
+        }
+        if readErr != nil {
+            return
+        }
+    }
+}
+
+func handleRequest(line []byte) fileResult {
+    var result fileResult
+    var request serverRequest
+    var hasBasicHandling, hasAdvancedHandling bool
+    err := json.Unmarshal(line, &request)
+    if err == nil {
+        switch {
+        case request.Code != nil:
+            hasBasicHandling, hasAdvancedHandling, err = analyzeSource("input.go", *request.Code)
+        case request.Path != nil:
+            result.Path = *request.Path
+            hasBasicHandling, hasAdvancedHandling, err = analyzeFile(*request.Path)
+        default:
+            err = fmt.Errorf("request has neither \"path\" nor \"code\"")
+        }
+    }
+    if err != nil {
+        result.Error = err.Error()
+    } else {
+        result.HasBasicHandling = hasBasicHandling
+        result.HasAdvancedHandling = hasAdvancedHandling
+    }
+    return result
+}
+
+func analyzeFile(filePath string) (bool, bool, error) {
+    return analyzeSource(filePath, nil)
+}
+
+// src is nil to read filename from disk, or the source code itself
+func analyzeSource(filename string, src interface{}) (bool, bool, error) {
+    fset := token.NewFileSet()
+
+    node, err := parser.ParseFile(fset, filename, src, parser.AllErrors)
+    if err != nil {
+        return false, false, err
+    }
+
     hasBasicHandling := false
     hasAdvancedHandling := false
 
@@ -54,5 +173,5 @@ func main() {
         return true
     })
 
-    fmt.Printf("%t,%t\n", hasBasicHandling, hasAdvancedHandling)
+    return hasBasicHandling, hasAdvancedHandling, nil
 }
@@ -1,29 +1,78 @@
 const babel = require('@babel/core');
 const fs = require('fs');
+const readline = require('readline');
 
-const filePath = process.argv[2];
-const code = fs.readFileSync(filePath, 'utf8');
-
-const ast = babel.parse(code, {
-    plugins: ['@babel/plugin-syntax-jsx', '@babel/plugin-syntax-typescript', '@babel/plugin-syntax-class-properties', '@babel/plugin-syntax-object-rest-spread'],
-    filename: filePath
-});
-
-let hasBasicHandling = false;
-let hasAdvancedHandling = false;
-
-babel.traverse(ast, {
-    TryStatement() {
-        hasBasicHandling = true;
-    },
-    CallExpression(path) {
-        const callee = path.node.callee;
-        if (callee.type === 'Identifier' && ['timeout', 'retry', 'circuitBreaker', 'backoff'].includes(callee.name)) {
-            hasAdvancedHandling = true;
-        } else if (callee.type === 'MemberExpression' && callee.property.name === 'status') {
+function analyzeJavaScript(code, filePath) {
+    const ast = babel.parse(code, {
+        plugins: ['@babel/plugin-syntax-jsx', '@babel/plugin-syntax-typescript', '@babel/plugin-syntax-class-properties', '@babel/plugin-syntax-object-rest-spread'],
+        filename: filePath
+    });
+
+    let hasBasicHandling = false;
+    let hasAdvancedHandling = false;
+
+    babel.traverse(ast, {
+        TryStatement() {
             hasBasicHandling = true;
+        },
+        CallExpression(path) {
+            const callee = path.node.callee;
+            if (callee.type === 'Identifier' && ['timeout', 'retry', 'circuitBreaker', 'backoff'].includes(callee.name)) {
+                hasAdvancedHandling = true;
+            } else if (callee.type === 'MemberExpression' && callee.property.name === 'status') {
+                hasBasicHandling = true;
+            }
+        }
+    });
+
+    return { hasBasicHandling, hasAdvancedHandling };
+}
+
+// Batch mode: "--batch <path>..." or "--manifest <file with one path per line>".
+// Prints a JSON array with one result object per input path.
+function runBatch(args) {
+    const paths = args[0] === '--manifest'
+        ? fs.readFileSync(args[1], 'utf8').split('\n').filter((line) => line.trim())
+        : args.slice(1);
+
+    const results = paths.map((filePath) => {
+        try {
+            const code = fs.readFileSync(filePath, 'utf8');
+            return { path: filePath, ...analyzeJavaScript(code, filePath) };
+        } catch (error) {
+            return { path: filePath, error: error.message };
+        }
+    });
+    console.log(JSON.stringify(results));
+}
+
+// Worker-server mode: one JSON request per stdin line ({"path": ...} or {"code": ...}),
+// one JSON result per stdout line. Exits when stdin is closed.
+function runServer() {
+    const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    rl.on('line', (line) => {
+        if (!line.trim()) {
+            return;
+        }
+        let response;
+        try {
+            const request = JSON.parse(line);
+            const filePath = request.path || 'input.js';
+            const code = request.code !== undefined ? request.code : fs.readFileSync(request.path, 'utf8');
+            response = analyzeJavaScript(code, filePath);
+        } catch (error) {
+            response = { error: error.message };
         }
-    }
-});
+        process.stdout.write(JSON.stringify(response) + '\n');
+    });
+}
 
-console.log(JSON.stringify({ hasBasicHandling, hasAdvancedHandling }));
\ No newline at end of file
+if (process.argv[2] === '--server') {
+    runServer();
+} else if (process.argv[2] === '--batch' || process.argv[2] === '--manifest') {
+    runBatch(process.argv.slice(2));
+} else {
+    const filePath = process.argv[2];
+    const code = fs.readFileSync(filePath, 'utf8');
+    console.log(JSON.stringify(analyzeJavaScript(code, filePath)));
+}
@@ -6,14 +6,11 @@ rescue Gem::LoadError => e
   puts "false,false"
   exit 1
 end
+require 'json'
 
-def analyze_ruby_code(code)
-  begin
-    ast = Parser::CurrentRuby.parse(code)
-  rescue Parser::SyntaxError => e
-    puts "false,false"  # Default to no error handling detected if parsing fails
-    return
-  end
+# Returns [has_basic_handling, has_advanced_handling]; raises Parser::SyntaxError on invalid code
+def detect_error_handling(code)
+  ast = Parser::CurrentRuby.parse(code)
 
   has_basic_handling = false
   has_advanced_handling = false
@@ -40,14 +37,53 @@ def analyze_ruby_code(code)
 
   process_node.call(ast)
 
+  [has_basic_handling, has_advanced_handling]
+end
+
+def analyze_ruby_code(code)
+  begin
+    has_basic_handling, has_advanced_handling = detect_error_handling(code)
+  rescue Parser::SyntaxError => e
+    puts "false,false"  # Default to no error handling detected if parsing fails
+    return
+  end
+
   puts "#{has_basic_handling},#{has_advanced_handling}"
 end
 
+# Batch mode: "--batch <path>..." or "--manifest <file with one path per line>".
+# Prints a JSON array with one result object per input path.
+def analyze_ruby_files(args)
+  paths = if args[0] == '--manifest'
+            File.readlines(args[1], chomp: true).reject { |line| line.strip.empty? }
+          else
+            args.drop(1)
+          end
+
+  results = paths.map do |path|
+    begin
+      has_basic_handling, has_advanced_handling = detect_error_handling(File.read(path))
+      { path: path, hasBasicHandling: has_basic_handling, hasAdvancedHandling: has_advanced_handling }
+    rescue Parser::SyntaxError
+      { path: path, hasBasicHandling: false, hasAdvancedHandling: false }
+    rescue => e
+      { path: path, error: e.message }
+    end
+  end
+
+  puts JSON.generate(results)
+end
+
 if ARGV.empty?
   puts "No Ruby code file provided."
   exit 1
 end
 
+if ARGV[0] == '--batch' || ARGV[0] == '--manifest'
+  analyze_ruby_files(ARGV)
+  exit 0
+end
+
 file_path = ARGV[0]
 begin
   ruby_code = File.read(file_path)
@@ -55,4 +91,4 @@ begin
 rescue => e
   puts "Error reading or processing file: #{e.message}"
   puts "false,false"  # Default to no error handling detected if file reading fails
-end
\ No newline at end of file
+end
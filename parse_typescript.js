@@ -1,5 +1,45 @@
 const ts = require('typescript');
 const fs = require('fs');
+const readline = require('readline');
+
+function analyzeTypeScript(filePath, code) {
+    const sourceFile = ts.createSourceFile(
+        filePath,
+        code,
+        ts.ScriptTarget.Latest,
+        true
+    );
+
+    let hasBasicHandling = false;
+    let hasAdvancedHandling = false;
+
+    function visit(node) {
+        if (ts.isTryStatement(node)) {
+            hasBasicHandling = true;
+        } else if (ts.isCallExpression(node)) {
+            const expression = node.expression;
+            if (ts.isIdentifier(expression)) {
+                const name = expression.escapedText;
+                if (['timeout', 'retry', 'circuitBreaker', 'backoff'].includes(name)) {
+                    hasAdvancedHandling = true;
+                }
+            } else if (ts.isPropertyAccessExpression(expression) &&
+                       ts.isIdentifier(expression.name) &&
+                       expression.name.escapedText === 'status') {
+                hasBasicHandling = true;
+            }
+        }
+
+        ts.forEachChild(node, visit);
+    }
+
+    visit(sourceFile);
+
+    return {
+        hasBasicHandling,
+        hasAdvancedHandling
+    };
+}
 
 function parseTypeScript(filePath) {
     let code;
@@ -13,42 +53,7 @@ function parseTypeScript(filePath) {
     }
 
     try {
-        const sourceFile = ts.createSourceFile(
-            filePath,
-            code,
-            ts.ScriptTarget.Latest,
-            true
-        );
-
-        let hasBasicHandling = false;
-        let hasAdvancedHandling = false;
-
-        function visit(node) {
-            if (ts.isTryStatement(node)) {
-                hasBasicHandling = true;
-            } else if (ts.isCallExpression(node)) {
-                const expression = node.expression;
-                if (ts.isIdentifier(expression)) {
-                    const name = expression.escapedText;
-                    if (['timeout', 'retry', 'circuitBreaker', 'backoff'].includes(name)) {
-                        hasAdvancedHandling = true;
-                    }
-                } else if (ts.isPropertyAccessExpression(expression) &&
-                           ts.isIdentifier(expression.name) &&
-                           expression.name.escapedText === 'status') {
-                    hasBasicHandling = true;
-                }
-            }
-
-            ts.forEachChild(node, visit);
-        }
-
-        visit(sourceFile);
-
-        console.log(JSON.stringify({
-            hasBasicHandling,
-            hasAdvancedHandling
-        }));
+        console.log(JSON.stringify(analyzeTypeScript(filePath, code)));
     } catch (error) {
         console.error(JSON.stringify({
             error: `Error parsing TypeScript: ${error.message}`
@@ -57,6 +62,45 @@ function parseTypeScript(filePath) {
     }
 }
 
+// Batch mode: "--batch <path>..." or "--manifest <file with one path per line>".
+// Prints a JSON array with one result object per input path.
+function runBatch(args) {
+    const paths = args[0] === '--manifest'
+        ? fs.readFileSync(args[1], 'utf8').split('\n').filter((line) => line.trim())
+        : args.slice(1);
+
+    const results = paths.map((filePath) => {
+        try {
+            const code = fs.readFileSync(filePath, 'utf8');
+            return { path: filePath, ...analyzeTypeScript(filePath, code) };
+        } catch (error) {
+            return { path: filePath, error: error.message };
+        }
+    });
+    console.log(JSON.stringify(results));
+}
+
+// Worker-server mode: one JSON request per stdin line ({"path": ...} or {"code": ...}),
+// one JSON result per stdout line. Exits when stdin is closed.
+function runServer() {
+    const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    rl.on('line', (line) => {
+        if (!line.trim()) {
+            return;
+        }
+        let response;
+        try {
+            const request = JSON.parse(line);
+            const filePath = request.path || 'input.ts';
+            const code = request.code !== undefined ? request.code : fs.readFileSync(request.path, 'utf8');
+            response = analyzeTypeScript(filePath, code);
+        } catch (error) {
+            response = { error: error.message };
+        }
+        process.stdout.write(JSON.stringify(response) + '\n');
+    });
+}
+
 if (process.argv.length < 3) {
     console.error(JSON.stringify({
         error: 'Please provide a file path as an argument.'
@@ -64,5 +108,10 @@ if (process.argv.length < 3) {
     process.exit(1);
 }
 
-const filePath = process.argv[2];
-parseTypeScript(filePath);
\ No newline at end of file
+if (process.argv[2] === '--server') {
+    runServer();
+} else if (process.argv[2] === '--batch' || process.argv[2] === '--manifest') {
+    runBatch(process.argv.slice(2));
+} else {
+    parseTypeScript(process.argv[2]);
+}
@@ -1,6 +1,17 @@
+import java.io.BufferedReader;
 import java.io.File;
 import java.io.FileNotFoundException;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
 
+import org.json.JSONArray;
 import org.json.JSONObject;
 
 import com.github.javaparser.StaticJavaParser;
@@ -14,8 +25,6 @@ import com.github.javaparser.ast.visitor.VoidVisitorAdapter;
 import com.github.javaparser.ParserConfiguration;
 
 public class JavaParserAnalyzer {
-    private static boolean hasBasicHandling = false;
-    private static boolean hasAdvancedHandling = false;
 
     public static void main(String[] args) {
         if (args.length < 1) {
@@ -27,22 +36,109 @@ public class JavaParserAnalyzer {
         config.setLanguageLevel(ParserConfiguration.LanguageLevel.RAW);
         StaticJavaParser.setConfiguration(config);
 
+        if (args[0].equals("--server")) {
+            runServer();
+            return;
+        }
+
+        if (args[0].equals("--batch") || args[0].equals("--manifest")) {
+            runBatch(args);
+            return;
+        }
+
         String filePath = args[0];
         try {
             CompilationUnit cu = StaticJavaParser.parse(new File(filePath));
-            cu.accept(new ErrorHandlingVisitor(), null);
-
-            JSONObject result = new JSONObject();
-            result.put("hasBasicHandling", hasBasicHandling);
-            result.put("hasAdvancedHandling", hasAdvancedHandling);
-            System.out.println(result.toString());
+            System.out.println(analyze(cu).toString());
         } catch (FileNotFoundException e) {
             System.err.println("File not found: " + filePath);
             System.exit(1);
         }
     }
 
+    // Worker-server mode: one JSON request per stdin line ({"path": ...} or {"code": ...}),
+    // one JSON result per stdout line. Exits when stdin is closed.
+    private static void runServer() {
+        PrintStream out = new PrintStream(System.out, true, StandardCharsets.UTF_8);
+        try (BufferedReader reader = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8))) {
+            String line;
+            while ((line = reader.readLine()) != null) {
+                if (line.isBlank()) {
+                    continue;
+                }
+                out.println(handleRequest(line).toString());
+            }
+        } catch (IOException e) {
+            System.err.println("Error reading requests: " + e.getMessage());
+        }
+    }
+
+    // Batch mode: "--batch <path>..." or "--manifest <file with one path per line>".
+    // Prints a JSON array with one result object per input path.
+    private static void runBatch(String[] args) {
+        List<String> paths = new ArrayList<>();
+        if (args[0].equals("--manifest")) {
+            try {
+                for (String path : Files.readAllLines(Paths.get(args[1]), StandardCharsets.UTF_8)) {
+                    if (!path.isBlank()) {
+                        paths.add(path);
+                    }
+                }
+            } catch (Exception e) {
+                System.err.println("Error reading manifest: " + e.getMessage());
+                System.exit(1);
+            }
+        } else {
+            paths.addAll(Arrays.asList(args).subList(1, args.length));
+        }
+
+        JSONArray results = new JSONArray();
+        for (String path : paths) {
+            JSONObject result;
+            try {
+                result = analyze(StaticJavaParser.parse(new File(path)));
+            } catch (Exception e) {
+                result = new JSONObject();
+                result.put("error", String.valueOf(e.getMessage()));
+            }
+            result.put("path", path);
+            results.put(result);
+        }
+        PrintStream out = new PrintStream(System.out, true, StandardCharsets.UTF_8);
+        out.println(results.toString());
+    }
+
+    private static JSONObject handleRequest(String line) {
+        try {
+            JSONObject request = new JSONObject(line);
+            CompilationUnit cu;
+            if (request.has("code")) {
+                cu = StaticJavaParser.parse(request.getString("code"));
+            } else {
+                cu = StaticJavaParser.parse(new File(request.getString("path")));
+            }
+            return analyze(cu);
+        } catch (Exception e) {
+            JSONObject error = new JSONObject();
+            error.put("error", String.valueOf(e.getMessage()));
+            return error;
+        }
+    }
+
+    private static JSONObject analyze(CompilationUnit cu) {
+        ErrorHandlingVisitor visitor = new ErrorHandlingVisitor();
+        cu.accept(visitor, null);
+
+        JSONObject result = new JSONObject();
+        result.put("hasBasicHandling", visitor.hasBasicHandling);
+        result.put("hasAdvancedHandling", visitor.hasAdvancedHandling);
+        return result;
+    }
+
     private static class ErrorHandlingVisitor extends VoidVisitorAdapter<Void> {
+        private boolean hasBasicHandling = false;
+        private boolean hasAdvancedHandling = false;
+
         @Override
         public void visit(TryStmt n, Void arg) {
             hasBasicHandling = true;
@@ -69,7 +165,7 @@ public class JavaParserAnalyzer {
         @Override
         public void visit(MethodCallExpr n, Void arg) {
             String methodName = n.getNameAsString().toLowerCase();
-            if (methodName.equals("timeout") || methodName.equals("retry") || 
+            if (methodName.equals("timeout") || methodName.equals("retry") ||
                 methodName.equals("circuitbreaker") || methodName.equals("backoff")) {
                 hasAdvancedHandling = true;
             } else if (methodName.equals("statuscode")) {
@@ -84,4 +180,4 @@ public class JavaParserAnalyzer {
             super.visit(n, arg);
         }
     }
-}
\ No newline at end of file
+}
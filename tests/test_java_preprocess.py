@@ -0,0 +1,57 @@
+"""Output of the single-pass preprocess_java_code on representative Java inputs.
+
+benchmarks/java_preprocess_benchmark.py compares the speed against the old multi-regex version;
+these cases pin what the preprocessing produces, so a change to JAVA_TOKEN_PATTERN cannot quietly
+alter what the java_preprocess_fallback retry hands to JavaParser.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebServFH
+
+# (input, expected output)
+CASES = [
+    # Comments are dropped; block comments keep their line breaks so line numbers stay put.
+    ('int a = 1; // trailing comment\nint b = 2;', 'int a = 1; \nint b = 2;\n'),
+    ('int a; /* block\n comment\n */ int b;', 'int a;  \n\n int b;\n'),
+
+    # Comment markers inside literals are left alone.
+    ('String s = "a // not a comment";', 'String s = "a // not a comment";\n'),
+    ('String s = "/* not */";', 'String s = "/* not */";\n'),
+    ('String s = "a \\"q\\" b";', 'String s = "a \\"q\\" b";\n'),
+
+    # Non-ASCII inside literals is escaped, smart quotes become plain ones.
+    ('String s = "héllo";', 'String s = "h\\u00e9llo";\n'),
+    ("char c = 'é';", "char c = '\\u00e9';\n"),
+    ('String s = “smart”;', 'String s = "smart";\n'),
+
+    # Literals left open at the end of the line are closed there.
+    ('String s = "unterminated\nint x;', 'String s = "unterminated"\nint x;\n'),
+    ('String s = "ends with \\\nint y;', 'String s = "ends with "\nint y;\n'),
+
+    # Text blocks are kept as they are, and closed when unterminated.
+    ('String t = """\n    text "block"\n    """;', 'String t = """\n    text "block"\n    """;\n'),
+    ('String t = """\n  unterminated', 'String t = """\n  unterminated"""\n'),
+
+    # Annotations directly before a type declaration are commented out, others are kept.
+    ('@Entity\nclass User {}', '/* @Entity */ class User {}\n'),
+    ('@Table(name = "users")\nclass User {}', '/* @Table(name = "users") */ class User {}\n'),
+    ('@Override\npublic void run() {}', '@Override\npublic void run() {}\n'),
+
+    # Stray symbols: colours become identifiers, non-ASCII outside literals is removed.
+    ('int color = #FF00AA;', 'int color = COLOR_FF00AA;\n'),
+    ('int x = 1; → y', 'int x = 1;  y\n'),
+
+    # Line endings and the byte order mark.
+    ('class A {}\r\nclass B {}', 'class A {}\nclass B {}\n'),
+    ('\ufeffclass A {}', 'class A {}\n'),
+]
+
+
+@pytest.mark.parametrize('code, expected', CASES)
+def test_preprocess_java_code(code, expected):
+    assert WebServFH.preprocess_java_code(code) == expected
@@ -0,0 +1,86 @@
+"""Verdicts of the tree-sitter engine on small snippets, and discovery's .gitignore rules.
+
+The snippets pin each language's rules to the verdict the external parser gives for the same code
+(see benchmarks/parser_parity.py for the comparison on real repositories). Languages whose
+tree-sitter grammar is not installed are skipped.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import WebServFH
+from parser_parity import GIT_RULE_CASES
+
+# (language, snippet, verdict)
+SNIPPETS = [
+    ('java', 'class A { void f() { int x = 1; } }', 'None'),
+    ('java', 'class A { void f() { try { g(); } catch (Exception e) { } } }', 'Basic'),
+    ('java', 'class A { void f() throws IOException { g(); } }', 'Basic'),
+    ('java', 'class A { void f() { client.Retry(3); } }', 'Advanced'),
+    ('java', 'class A { void f() { try { client.timeout(5); } finally { } } }', 'Both'),
+    ('java', 'class A { void f() { try { g(); ', 'None'),
+
+    ('javascript', 'const x = 1;', 'None'),
+    ('javascript', 'try { f(); } catch (e) { }', 'Basic'),
+    ('javascript', 'res.status(404);', 'Basic'),
+    ('javascript', 'retry(fetchData);', 'Advanced'),
+    ('javascript', 'Retry(fetchData);', 'None'),
+    ('javascript', 'res.status(500); backoff(2);', 'Both'),
+    ('javascript', 'try { f(); ', 'None'),
+
+    ('typescript', 'const x: number = 1;', 'None'),
+    ('typescript', 'try { f(); } catch (e: unknown) { }', 'Basic'),
+    ('typescript', 'circuitBreaker(call as () => void);', 'Advanced'),
+    ('typescript', 'try { timeout(1000); } catch { }', 'Both'),
+
+    ('go', 'package main\n\nfunc f() { x := 1; _ = x }\n', 'None'),
+    ('go', 'package main\n\nfunc f() error {\n\terr := g()\n\tif err != nil {\n\t\treturn err\n\t}\n\treturn nil\n}\n', 'Basic'),
+    ('go', 'package main\n\nfunc f() { _ = resp.StatusCode() }\n', 'Basic'),
+    ('go', 'package main\n\nfunc f() { client.SetTimeout(5) }\n', 'Advanced'),
+    ('go', 'package main\n\nfunc f() {\n\tif err != nil {\n\t}\n\tpolicy.WithBackoff()\n}\n', 'Both'),
+    ('go', 'package main\n\nfunc f() {\n\tif err != nil {\n', 'None'),
+
+    ('ruby', 'x = 1\n', 'None'),
+    ('ruby', 'begin\n  f\nrescue StandardError\n  nil\nend\n', 'Basic'),
+    ('ruby', 'puts response.code\n', 'Basic'),
+    ('ruby', 'http.timeout(5)\n', 'Advanced'),
+    ('ruby', 'begin\n  policy.backoff(2)\nrescue\nend\n', 'Both'),
+    ('ruby', 'begin\n  f(\n', 'None'),
+
+    ('csharp', 'class A { void F() { var x = 1; } }', 'None'),
+    ('csharp', 'class A { void F() { try { G(); } catch (Exception) { } } }', 'Basic'),
+    ('csharp', 'class A { void F() { response.EnsureSuccessStatusCode(); } }', 'Basic'),
+    ('csharp', 'class A { void F() { policy.retry(3); } }', 'Advanced'),
+    ('csharp', 'class A { void F() { try { Policy.CircuitBreaker(); } finally { } } }', 'Both'),
+
+    ('kotlin', 'val x = 1', 'None'),
+    ('kotlin', 'try { f() } catch (e: Exception) { }', 'Basic'),
+    ('kotlin', 'if (response.code == 500) { }', 'Basic'),
+    ('kotlin', 'client.timeout(1000)', 'Advanced'),
+    ('kotlin', 'withTimeout(1000) { f() }', 'None'),
+    ('kotlin', 'try { retry(3) } catch (e: Exception) { }', 'Both'),
+
+    ('swift', 'let x = 1\n', 'None'),
+    ('swift', 'do {\n    try f()\n} catch {\n}\n', 'Basic'),
+    ('swift', 'func statusCode() -> Int { return 1 }\n', 'Basic'),
+    ('swift', 'retry(3)\n', 'Advanced'),
+    ('swift', 'do {\n    timeout(5)\n} catch {\n}\n', 'Both'),
+]
+
+
+@pytest.mark.parametrize('language, snippet, verdict', SNIPPETS)
+def test_tree_sitter_verdict(language, snippet, verdict):
+    if not WebServFH.tree_sitter_available(language):
+        pytest.skip(f'tree-sitter grammar for {language} is not installed')
+    assert WebServFH.analyze_with_tree_sitter(language, snippet.encode('utf-8')) == verdict
+
+
+@pytest.mark.parametrize('line, relative_path, ignored', GIT_RULE_CASES)
+def test_gitignore_rule(line, relative_path, ignored):
+    rules = WebServFH.load_git_rules(lambda name: line if name == '.gitignore' else None)
+    assert WebServFH.is_excluded_by_rules(relative_path, rules) == ignored